@@ -1,30 +1,79 @@
 
+import time
+STARTUP_STARTED = time.perf_counter()
+
 import webbrowser
 import json
 import os
 import getpass
-import bcrypt
-import validators
-import requests
 import csv
-import yaml
 import xml.etree.ElementTree as ET
-from docx import Document
-import pandas as pd
-import tkinter as tk
-from tkinter import filedialog
-import pyperclip
-from datetime import datetime
+from datetime import datetime, timedelta
 from colorama import init, Fore
 import re  
 import logging  
+import importlib
 import importlib.util
-
-from typing import Dict, Any
+import pickle
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+import sys
+import inspect
+import hashlib
+import sqlite3
+import mmap
+import struct
+from array import array
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+from collections.abc import MutableMapping
+from bisect import bisect_left, insort
+from collections import defaultdict, deque
+import difflib
+from types import MappingProxyType, ModuleType
+from functools import lru_cache
+from contextlib import contextmanager
+import argparse
+
+from typing import Dict, Any, Optional, Mapping, Callable, NamedTuple
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 
+# Версия API плагинов: 1 - метод run со всем словарем ссылок, 2 - события изменений (ChangeSetPlugin)
+PLUGIN_API_VERSION = 2
+
+
+class LinkChangeEvent(NamedTuple):
+    """
+    Изменение хранилища ссылок.
+
+    sequence - номер события, возрастающий в пределах сеанса программы.
+    type - 'added', 'updated', 'deleted', 'renamed' или 'imported'.
+    before/after - данные ссылки до и после изменения (только для чтения;
+    dict(event.after) дает обычный словарь, например для json.dumps).
+    old_key - прежний ключ для 'renamed'; records - импортированные ссылки для 'imported'.
+    """
+    sequence: int
+    type: str
+    key: Optional[str]
+    before: Optional[Mapping[str, Optional[str]]] = None
+    after: Optional[Mapping[str, Optional[str]]] = None
+    old_key: Optional[str] = None
+    records: Optional[Mapping[str, Mapping[str, Optional[str]]]] = None
+
 class LinkManagerPlugin(ABC):
+    api_version: int = 1
+    # Вызовы плагина выполняются в фоне; при ordered = True - строго по очереди
+    ordered: bool = True
+    # Время на один вызов в секундах; None - значение plugin_timeout из настроек
+    timeout: Optional[float] = None
+
     @staticmethod
     @abstractmethod
     def plugin_info() -> Dict[str, Any]:
@@ -35,12 +84,15 @@ class LinkManagerPlugin(ABC):
         pass
 
     @abstractmethod
-    def run(self, url_links: Dict[str, Dict[str, str]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+    def run(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
         """
         Основной метод плагина, вызываемый Link Manager.
 
         Args:
-            url_links: Словарь всех URL-ссылок.
+            url_links: Копия всех URL-ссылок на момент вызова - обычный словарь из обычных словарей
+                (плагин работает в фоновом потоке). Сделанные в ней изменения сохраняются одним
+                пакетом после того, как run вернет управление; если run завершился с ошибкой
+                или не уложился во время, изменения не сохраняются.
             action: Действие, вызвавшее плагин (например, 'open', 'add', 'delete', 'export').
             key: Ключ URL, если действие связано с конкретной ссылкой.
             kwargs: Дополнительные аргументы, которые могут быть переданы плагину.
@@ -51,28 +103,159 @@ class LinkManagerPlugin(ABC):
         pass
 
 
-from __main__ import LinkManagerPlugin
+class AsyncLinkManagerPlugin(LinkManagerPlugin):
+    """
+    Плагин с асинхронным методом run_async. Link Manager выполняет его в цикле
+    событий и отменяет вызов, если он не уложился в отведенное время.
+    """
+
+    @abstractmethod
+    async def run_async(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+        """
+        Асинхронный вариант метода run с теми же аргументами.
+        """
+        pass
+
+    def run(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+        return asyncio.run(self.run_async(url_links, action, key, **kwargs))
+
+
+class ChangeSetPlugin(LinkManagerPlugin):
+    """
+    Плагин API версии 2. Вместо всего словаря ссылок при каждом изменении получает
+    событие LinkChangeEvent; снимок всех ссылок можно запросить функцией snapshot.
+    Метод run по-прежнему вызывается для действий, не меняющих ссылки ('open', 'export').
+    """
+    api_version: int = 2
+
+    @abstractmethod
+    def on_change(self, event: LinkChangeEvent, snapshot: Callable[[], Mapping[str, Mapping[str, Optional[str]]]]) -> Any:
+        """
+        Вызывается после каждого изменения ссылок.
+
+        Args:
+            event: Описание изменения.
+            snapshot: Функция, возвращающая снимок всех ссылок только для чтения.
+        """
+        pass
+
+    def run(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+        pass
+
+
+# При запуске дочерних процессов (проверка URL) модуль импортируется под другим именем
+if __name__ == "__main__":
+    from __main__ import LinkManagerPlugin, AsyncLinkManagerPlugin, ChangeSetPlugin, LinkChangeEvent
 
 init(autoreset=True)
 
+
+class LazyModule:
+    """Модуль, который импортируется при первом обращении к его атрибутам."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            lazy_import_timings[self._name] = time.perf_counter() - started
+            logging.debug(f"Модуль {self._name} загружен за {lazy_import_timings[self._name] * 1000:.1f} мс")
+        return self._module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        return f"<LazyModule {self._name} ({'загружен' if self._module is not None else 'не загружен'})>"
+
+
+# Тяжелые зависимости нужны только отдельным форматам и функциям,
+# поэтому импортируются при первом использовании, а не при запуске
+lazy_import_timings = {}
+bcrypt = LazyModule('bcrypt')
+validators = LazyModule('validators')
+requests = LazyModule('requests')
+requests_adapters = LazyModule('requests.adapters')
+urllib3_retry = LazyModule('urllib3.util.retry')
+yaml = LazyModule('yaml')
+docx = LazyModule('docx')
+pd = LazyModule('pandas')
+tk = LazyModule('tkinter')
+filedialog = LazyModule('tkinter.filedialog')
+pyperclip = LazyModule('pyperclip')
+# Нужен только асинхронным плагинам, а при импорте загружает еще и ssl
+asyncio = LazyModule('asyncio')
+LAZY_MODULES = (bcrypt, validators, requests, requests_adapters, urllib3_retry, yaml, docx, pd, tk, filedialog, pyperclip, asyncio)
+
+startup_timings = []
+
+@contextmanager
+def startup_step(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings.append((name, time.perf_counter() - started))
+
 DOCUMENTS_DIR = os.path.join(os.path.expanduser("~"), "Documents", "LinkManager files")
 LINKS_FILENAME = os.path.join(DOCUMENTS_DIR, 'url_links.json')
+JOURNAL_FILENAME = os.path.join(DOCUMENTS_DIR, 'url_links.journal')
+JOURNAL_COMPACTING_FILENAME = os.path.join(DOCUMENTS_DIR, 'url_links.journal.compacting')
+DB_FILENAME = os.path.join(DOCUMENTS_DIR, 'url_links.db')
+SNAPSHOT_FILENAME = os.path.join(DOCUMENTS_DIR, 'url_links.snap')
 SETTINGS_FILENAME = os.path.join(DOCUMENTS_DIR, 'settings.json')
 LOG_FILENAME = os.path.join(DOCUMENTS_DIR, 'link_manager.log')
 STATISTICS_FILENAME = os.path.join(DOCUMENTS_DIR, 'statistics.json')
+HEALTH_CACHE_FILENAME = os.path.join(DOCUMENTS_DIR, 'link_health.json')
+UPDATE_CHECK_FILENAME = os.path.join(DOCUMENTS_DIR, 'update_check.json')
 PLUGINS_DIR = os.path.join(DOCUMENTS_DIR, 'plugins') 
 PLUGIN_CONFIG_FILENAME = os.path.join(PLUGINS_DIR, 'plugins_config.json') 
+PLUGIN_MANIFEST_FILENAME = os.path.join(PLUGINS_DIR, 'plugins_manifest.json')
+PLUGIN_MANIFEST_VERSION = 1
+DEFAULT_PASSWORD = "1234"
 
 logging.basicConfig(filename=LOG_FILENAME, level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 default_settings = {
-    "password": bcrypt.hashpw("1234".encode(), bcrypt.gensalt()).decode(),
+    # None - пароль по умолчанию (1234); его хэш вычисляется только при проверке
+    "password": None,
     "password_required": False,
     "show_links": True,
     "log_level": "INFO",  
     "debug_mode": False,
     "use_regex": False,  
-    "use_validators": True  
+    "use_validators": True,
+    "check_max_workers": 16,
+    "check_per_host_limit": 4,
+    "health_cache_ttl": 3600,
+    "health_cache_negative_ttl": 300,
+    "health_cache_max_entries": 5000,
+    "http_timeout": 5,
+    "http_retries": 2,
+    "http_backoff_factor": 0.3,
+    "update_check_interval": 86400,
+    "import_batch_size": 5000,
+    # Пачки от validation_process_threshold URL проверяются в validation_workers процессах (None - по числу ядер, 1 - без процессов)
+    "validation_workers": None,
+    "validation_process_threshold": 2000,
+    # Движки pandas для XLSX, например "calamine" для чтения и "xlsxwriter" для записи; None - по умолчанию
+    "xlsx_read_engine": None,
+    "xlsx_write_engine": None,
+    "offline_mode": False,
+    "journal_max_records": 1000,
+    "storage_backend": "json",
+    # Хранить рядом с url_links.json бинарный снимок для быстрой загрузки больших списков
+    "binary_snapshot": False,
+    "normalize_urls": False,
+    "regex_timeout": 5,
+    "regex_max_pattern_length": 500,
+    "regex_guard": True,
+    "plugin_workers": 4,
+    "plugin_timeout": 10,
+    "plugin_inspect_timeout": 15
 }
 
 default_links = {
@@ -92,96 +275,1288 @@ statistics = {
 
 default_plugins_config = {"plugins":[]}
 
-
-def save_statistics(statistics):
+plugins_config_cache = None
+plugins_config_mtime = None
+
+health_cache = {}
+health_cache_lock = threading.Lock()
+
+journal_lock = threading.Lock()
+journal_record_count = 0
+compaction_thread = None
+# Больше нуля, пока сжатие журнала отложено (см. deferred_journal_compaction)
+journal_compaction_deferred = 0
+# Отображенный в память бинарный снимок, из которого загружены ссылки
+links_snapshot = None
+links_snapshot_lock = threading.Lock()
+
+db_connection = None
+db_lock = threading.RLock()
+db_fts_enabled = False
+
+http_session = None
+http_session_lock = threading.Lock()
+
+# Результаты проверки URL для каждого сочетания (use_validators, use_regex)
+url_validation_memo = {}
+URL_VALIDATION_MEMO_LIMIT = 200_000
+validation_pool = None
+# True, если пул процессов не запустился; до конца сеанса URL проверяются в основном процессе
+validation_pool_disabled = False
+
+# Сообщения фоновой проверки обновлений; выводятся перед следующим показом меню
+update_notices = deque()
+update_check_thread = None
+
+# Статусы, с которыми некоторые серверы отвечают на HEAD, хотя GET для них работает
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 501}
+
+
+# Параметры запроса, которые не влияют на содержимое страницы
+TRACKING_QUERY_PARAMS = {"gclid", "fbclid", "yclid", "dclid", "msclkid", "mc_cid", "mc_eid", "_openstat", "igshid"}
+DEFAULT_PORTS = {"http": 80, "https": 443, "ftp": 21}
+
+@lru_cache(maxsize=65536)
+def normalize_url(url):
+    """
+    Приводит URL к виду, в котором почти одинаковые адреса совпадают:
+    схема и хост в нижнем регистре, без порта по умолчанию, без завершающего слэша
+    и без трекинговых параметров (utm_* и т.п.).
+    """
     try:
-        with open(STATISTICS_FILENAME, 'w', encoding='utf-8') as f:
-            json.dump(statistics, f, ensure_ascii=False, indent=4)
-        logging.info("Статистика сохранена в файл.")
-    except IOError as e:
-        logging.error(f"Ошибка при сохранении статистики: {e}")
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc += f":{port}"
+    if parts.username is not None:
+        userinfo = parts.username + (f":{parts.password}" if parts.password is not None else "")
+        netloc = f"{userinfo}@{netloc}"
+    path = parts.path.rstrip("/")
+    query = urlencode([(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not name.lower().startswith("utm_") and name.lower() not in TRACKING_QUERY_PARAMS])
+    return urlunsplit((scheme, netloc, path, query, parts.fragment))
+
+class UniqueIndex:
+    """
+    Индекс значение -> ключ ссылки. Если значение повторяется, в индексе остается
+    ключ, добавленный первым, а остальные ключи хранятся отдельно.
+    """
+
+    def __init__(self):
+        self._primary = {}
+        self._duplicates = {}
+
+    def add(self, value, key):
+        if value in self._primary:
+            self._duplicates.setdefault(value, []).append(key)
+            return False
+        self._primary[value] = key
+        return True
+
+    def remove(self, value, key):
+        """Удаляет ключ и возвращает True, если для значения не осталось ключей."""
+        if self._primary.get(value) == key:
+            duplicates = self._duplicates.get(value)
+            if duplicates:
+                self._primary[value] = duplicates.pop(0)
+                if not duplicates:
+                    del self._duplicates[value]
+                return False
+            del self._primary[value]
+            return True
+        duplicates = self._duplicates.get(value)
+        if duplicates and key in duplicates:
+            duplicates.remove(key)
+            if not duplicates:
+                del self._duplicates[value]
+        return False
 
+    def get(self, value):
+        return self._primary.get(value)
 
-def load_plugins_config():
+    def clear(self):
+        self._primary.clear()
+        self._duplicates.clear()
+
+    def __contains__(self, value):
+        return value in self._primary
+
+    def indexed_values(self):
+        return self._primary.keys()
+
+    def key_map(self):
+        """Обратный индекс: ключ -> значение."""
+        result = {key: value for value, key in self._primary.items()}
+        for value, keys in self._duplicates.items():
+            for key in keys:
+                result[key] = value
+        return result
+
+
+SEARCH_FIELDS = ('url', 'category', 'description')
+# Повторяемая группа, которая заканчивается квантификатором, например (a+)+ или (\w*)*, или содержит
+# альтернативу, например (a|aa)+. Группы вида (\w+\.)+ не считаются опасными: разделитель в конце
+# не дает повторениям перекрываться
+NESTED_QUANTIFIER_PATTERN = re.compile(r'\((?:[^()\\]|\\.)*(?:[+*}]|\|(?:[^()\\]|\\.)*)\)[+*{]')
+
+# Форматы даты добавления, которые встречаются в файлах импорта (первый - формат str(datetime.now()))
+DATE_ADDED_FORMATS = ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+                      '%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d.%m.%Y', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y')
+
+@lru_cache(maxsize=4096)
+def parse_date_added(value):
+    """Возвращает datetime для даты добавления в любом из известных форматов или None."""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
     try:
-        with open(PLUGIN_CONFIG_FILENAME, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                return config
-    except (json.JSONDecodeError, IOError) as e:
-                print(Fore.RED + f"Ошибка загрузки конфигурации плагинов: {e}")
-                logging.error(f"Ошибка загрузки конфигурации плагинов: {e}")
-    return default_plugins_config
+        parsed = datetime.fromisoformat(value)
+        return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
+    except ValueError:
+        pass
+    for date_format in DATE_ADDED_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+DATE_EPOCH = datetime(1970, 1, 1)
+
+def date_to_timestamp(value):
+    # Без обращения к часовому поясу ОС: timestamp() для старых дат падает на Windows
+    return (value - DATE_EPOCH).total_seconds()
+
+def normalize_date_added(value):
+    """Приводит дату добавления к виду str(datetime); нераспознанное значение возвращает как есть."""
+    parsed = parse_date_added(value)
+    return str(parsed) if parsed is not None else value
+
+def encode_date_added(value):
+    """Дату вида str(datetime) переводит в целое число микросекунд от 1970-01-01, остальное оставляет как есть."""
+    # Вид str(datetime): 'YYYY-MM-DD HH:MM:SS' или 'YYYY-MM-DD HH:MM:SS.ffffff' с ненулевыми микросекундами;
+    # разделители проверяются вместо сравнения с str(parsed), которое в несколько раз дороже разбора
+    if type(value) is not str or not (len(value) == 19 or (len(value) == 26 and value[19] == '.')) \
+            or value[4] != '-' or value[7] != '-' or value[10] != ' ' or value[13] != ':' or value[16] != ':':
+        return value
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if len(value) == 26 and not parsed.microsecond:
+        return value
+    return (parsed - DATE_EPOCH) // MICROSECOND
+
+def decode_date_added(value):
+    return str(DATE_EPOCH + timedelta(microseconds=value)) if type(value) is int else value
+
+MICROSECOND = timedelta(microseconds=1)
+# Поле записи -> слот Link, в котором оно хранится
+LINK_SLOTS = (('url', 'url'), ('date_added', '_date_added'), ('category', 'category'), ('description', 'description'))
+LINK_FIELD_SLOTS = dict(LINK_SLOTS)
+
+
+class Link(MutableMapping):
+    """
+    Данные одной ссылки. Поля лежат в слотах, а не в словаре: категория интернируется
+    (одна строка на все ссылки с этой категорией), дата добавления вида str(datetime)
+    хранится числом. Для плагинов и экспорта запись ведет себя как словарь
+    {"url", "date_added", "category", "description", ...}; dict(link) дает обычный словарь.
+    """
+    __slots__ = ('url', '_date_added', 'category', 'description', '_extra')
+
+    def __init__(self, data=None):
+        self._extra = None
+        if data:
+            # Обычные поля записываются в слоты напрямую, минуя __setitem__: так загрузка заметно быстрее
+            for name, value in data.items():
+                if name == 'url':
+                    self.url = value
+                elif name == 'category':
+                    self.category = sys.intern(value) if type(value) is str else value
+                elif name == 'description':
+                    self.description = value
+                elif name == 'date_added' and type(value) is str:
+                    self._date_added = encode_date_added(value)
+                else:
+                    self[name] = value
+
+    def __getitem__(self, name):
+        slot = LINK_FIELD_SLOTS.get(name)
+        if slot is not None:
+            try:
+                value = getattr(self, slot)
+            except AttributeError:
+                pass
+            else:
+                return decode_date_added(value) if slot == '_date_added' else value
+        if self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        if name == 'url':
+            self.url = value
+        elif name == 'date_added' and type(value) is not int:
+            # Целое число в слоте означает закодированную дату, поэтому числа, заданные явно, хранятся как есть в _extra
+            self._date_added = encode_date_added(value)
+        elif name == 'category':
+            self.category = sys.intern(value) if type(value) is str else value
+        elif name == 'description':
+            self.description = value
+        else:
+            if name == 'date_added' and hasattr(self, '_date_added'):
+                del self._date_added
+            if self._extra is None:
+                self._extra = {}
+            self._extra[name] = value
+            return
+        if self._extra is not None:
+            self._extra.pop(name, None)
+
+    def __delitem__(self, name):
+        slot = LINK_FIELD_SLOTS.get(name)
+        if slot is not None and hasattr(self, slot):
+            delattr(self, slot)
+        elif self._extra is not None and name in self._extra:
+            del self._extra[name]
+        else:
+            raise KeyError(name)
+
+    def __iter__(self):
+        for field, slot in LINK_SLOTS:
+            if hasattr(self, slot):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for field, slot in LINK_SLOTS if hasattr(self, slot)) + len(self._extra or ())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def copy(self):
+        """Обычный словарь с полями ссылки."""
+        data = {field: getattr(self, slot) for field, slot in LINK_SLOTS if hasattr(self, slot)}
+        if 'date_added' in data:
+            data['date_added'] = decode_date_added(data['date_added'])
+        if self._extra:
+            data.update(self._extra)
+        return data
 
-def save_plugins_config(config):
+    @property
+    def timestamp(self):
+        """Дата добавления в секундах от 1970-01-01 или None, если дата не распознана."""
+        value = getattr(self, '_date_added', None)
+        if type(value) is int:
+            return value / 1_000_000
+        parsed = parse_date_added(value)
+        return date_to_timestamp(parsed) if parsed is not None else None
+
+def as_link(data):
+    # Проверка type() вместо isinstance(): isinstance() для наследников Mapping идет через ABCMeta и стоит заметно дороже
+    return data if type(data) is Link or type(data) is SnapshotRecord else Link(data)
+
+def link_timestamp(data):
+    if isinstance(data, Link):
+        return data.timestamp
+    parsed = parse_date_added(data.get('date_added'))
+    return date_to_timestamp(parsed) if parsed is not None else None
+
+def build_search_text(key, data):
+    # Поля проверяются по отдельности: в склеенной строке \s, \W и [^...] совпадали бы на стыке полей
+    return (key,) + tuple(str(data.get(field) or '') for field in SEARCH_FIELDS)
+
+@lru_cache(maxsize=128)
+def compile_search_pattern(query):
+    return re.compile(query, re.IGNORECASE)
+
+def get_search_pattern(query):
+    """
+    Проверяет и компилирует регулярное выражение для поиска.
+    При ошибке выводит сообщение и возвращает None.
+    """
+    max_length = settings.get("regex_max_pattern_length", default_settings["regex_max_pattern_length"])
+    if len(query) > max_length:
+        print(Fore.RED + f"Регулярное выражение слишком длинное (больше {max_length} символов).")
+        logging.warning(f"Отклонено слишком длинное регулярное выражение: {len(query)} символов.")
+        return None
+    if settings.get("regex_guard", default_settings["regex_guard"]) and NESTED_QUANTIFIER_PATTERN.search(query):
+        print(Fore.RED + "Выражение содержит повторяемую группу с квантификатором или альтернативой (например, (a+)+ или (a|aa)+) "
+                         "и может выполняться очень долго. "
+                         "Упростите выражение или отключите защиту в меню настроек.")
+        logging.warning(f"Отклонено потенциально медленное регулярное выражение: '{query}'")
+        return None
     try:
-        with open(PLUGINS_CONFIG_FILENAME, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=4)
-        logging.info("Конфигурация плагинов сохранена.")
-    except IOError as e:
-        print(Fore.RED + f"Ошибка при сохранении конфигурации плагинов: {e}")
-        logging.error(f"Ошибка при сохранении конфигурации плагинов: {e}")
+        return compile_search_pattern(query)
+    except re.error as e:
+        print(Fore.RED + f"Неверное регулярное выражение: {e}.")
+        logging.warning(f"Неверное регулярное выражение '{query}': {e}")
+        return None
+
+def regex_match_keys(pattern, texts):
+    search = pattern.search
+    return [key for key, fields in texts if any(search(field) for field in fields)]
+
+def regex_search_process(connection, pattern, texts):
+    # Выполняется в дочернем процессе, поэтому ничего не пишет в журнал
+    try:
+        connection.send(regex_match_keys(pattern, texts))
+    finally:
+        connection.close()
+
+def regex_search_keys(links, pattern):
+    """
+    Возвращает ключи ссылок, подходящих под скомпилированное выражение.
+    Поиск выполняется в дочернем процессе: один неудачный шаблон может перебирать варианты
+    на одной строке сколь угодно долго, а процесс, в отличие от потока, можно остановить.
+    Если поиск длится дольше regex_timeout секунд, выбрасывает TimeoutError.
+    """
+    if isinstance(links, LinkStore):
+        texts = list(links.search_texts())
+    else:
+        texts = [(key, build_search_text(key, data)) for key, data in links.items()]
+    timeout = settings.get("regex_timeout", default_settings["regex_timeout"])
+    # fork не копирует строки для поиска в дочерний процесс; там, где его нет, они передаются через pickle
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=regex_search_process, args=(sender, pattern, texts), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            raise TimeoutError(f"поиск длился дольше {timeout} с")
+        return receiver.recv()
+    except EOFError:
+        raise RuntimeError(f"процесс поиска завершился с кодом {process.exitcode}")
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+# Вес совпадения в каждом поле при ранжировании результатов поиска
+SEARCH_FIELD_WEIGHTS = {'key': 4, 'category': 3, 'url': 2, 'description': 1}
+TOKEN_PATTERN = re.compile(r'\w+')
+# Слова короче триграммы индекс не сужает, а запрос только из таких слов подходит почти ко всем ссылкам
+SEARCH_MIN_TERM_LENGTH = 3
+
+def keyword_search_text(key, data):
+    # Поля склеиваются через \x00, которого нет в запросах, поэтому слово запроса не совпадет на стыке полей
+    return "\x00".join([key] + [str(data.get(field) or '') for field in SEARCH_FIELDS]).lower()
+
+def keyword_search_keys(texts, query, keys=None):
+    """
+    Поиск по ключевому слову: ключи ссылок, в ключе, URL, категории или описании которых
+    встречается каждое слово запроса (как подстрока, без учета регистра). Так же ищет и
+    search_links_sql. texts - словарь ключ -> keyword_search_text, keys - ключи, которые нужно
+    проверить (по умолчанию все). Если в запросе есть слово от трех символов, ключи отсортированы
+    по релевантности, иначе идут в исходном порядке: такой запрос подходит почти ко всем
+    ссылкам, и ранжирование стоило бы дороже самого поиска.
+    """
+    terms = query.lower().split()
+    # Списки только из ключей: пары (ключ, строка) для каждой ссылки заметно замедляют поиск из-за сборщика мусора
+    matched = texts.keys() if keys is None else keys
+    for term in terms:
+        matched = [key for key in matched if term in texts[key]]
+    if not any(len(term) >= SEARCH_MIN_TERM_LENGTH for term in terms):
+        return list(matched)
+
+    weights = [SEARCH_FIELD_WEIGHTS[name] for name in ('key',) + SEARCH_FIELDS]
+    # Совпадение с целым словом ссылки весит больше, чем с частью слова
+    words = [re.compile(r'(?<!\w)' + re.escape(term) + r'(?!\w)').search for term in terms if TOKEN_PATTERN.fullmatch(term)]
+    scored = []
+    for key in matched:
+        text = texts[key]
+        score = 0
+        for weight, field in zip(weights, text.split("\x00")):
+            for term in terms:
+                if term in field:
+                    score += weight
+        for word in words:
+            if word(text):
+                score += 1
+        scored.append((-score, key.casefold(), key))
+    scored.sort()
+    return [key for _, _, key in scored]
+
+class SearchIndex:
+    """
+    Индекс для поиска по ключевому слову: строка поиска каждой ссылки (keyword_search_text)
+    и инвертированный индекс триграмм этих строк -> множество ключей ссылок.
+    """
+
+    def __init__(self):
+        self._texts = {}
+        self._trigrams = defaultdict(set)
+
+    def add(self, key, data):
+        text = self._texts[key] = keyword_search_text(key, data)
+        for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            self._trigrams[gram].add(key)
+
+    def remove(self, key):
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            postings = self._trigrams.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._trigrams[gram]
+
+    def clear(self):
+        self._texts.clear()
+        self._trigrams.clear()
+
+    def _candidates(self, term):
+        """Ключи, которые могут содержать term; None - если индекс не сужает поиск."""
+        # Слово короче триграммы ищется как подстрока ("go" в "google"), поэтому такие слова проверяются перебором
+        if len(term) < SEARCH_MIN_TERM_LENGTH:
+            return None
+        postings = []
+        for gram in {term[i:i + 3] for i in range(len(term) - 2)}:
+            keys = self._trigrams.get(gram)
+            if keys is None:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def search(self, keys, query):
+        """Поиск по ключевому слову (см. keyword_search_keys) среди ключей keys, например всех ключей хранилища."""
+        candidates = None
+        for term in sorted(query.lower().split(), key=len, reverse=True):
+            term_candidates = self._candidates(term)
+            if term_candidates is None:
+                continue
+            candidates = term_candidates if candidates is None else candidates & term_candidates
+            if not candidates:
+                return []
+        return keyword_search_keys(self._texts, query, keys if candidates is None else candidates)
+
+
+class LinkBatch:
+    """Незавершенный пакет изменений LinkStore (см. LinkStore.batch)."""
+
+    def __init__(self, store):
+        # Ключ -> данные до начала пакета (None - ключа не было)
+        self.original = {}
+        # Порядок ключей до пакета; запоминается при первом удалении, после которого откат изменил бы порядок
+        self.order = None
+        self.events = []
+        # Индексы, существовавшие в начале пакета; их обновление отложено до завершения пакета
+        self.search_index = store._search_index
+        self.search_texts = store._search_texts
+        self.date_index = store._date_index
+
+
+class LinkStore(MutableMapping):
+    """
+    Словарь ссылок {ключ: данные ссылки} с индексами, которые обновляются
+    при каждом добавлении, удалении и переименовании:
+    URL -> ключ, ключ без учета регистра -> ключ, номер -> ключ,
+    отсортированный список ключей для автодополнения и индекс полнотекстового поиска.
+    После каждого изменения подписчики получают событие LinkChangeEvent.
+    Несколько изменений можно сгруппировать в пакет: with store.batch(): ...
+    Запись нужно заменять целиком (store[key] = {...}): изменение поля на месте
+    (store[key]['url'] = ...) не обновляет индексы и не сохраняется.
+    """
+
+    def __init__(self, links=None, normalize_urls=False):
+        self._links = {}
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._sequence = 0
+        self._snapshot = None
+        self._normalize_urls = normalize_urls
+        # Индекс URL строится при первой проверке на дубликат: нормализация всех URL заметно замедляет запуск
+        self._url_index = None
+        self._key_index = UniqueIndex()
+        self._sorted_folded_keys = []
+        # При пакетном добавлении новые ключи копятся здесь и сортируются один раз
+        self._pending_folded_keys = None
+        # Индекс поиска строится в фоне (start_search_index_build), строки для регулярных выражений -
+        # при первом поиске по ним, чтобы не замедлять запуск
+        self._search_index = None
+        # Ключи, измененные во время фонового построения индекса поиска, или None, если он не строится
+        self._search_index_changes = None
+        self._search_texts = None
+        # Отсортированный список (время добавления, ключ); строится при первом фильтре по дате
+        self._date_index = None
+        self._date_values = {}
+        # Список ключей по порядку; после удаления пересобирается при первом обращении
+        self._ordinal = []
+        # Незавершенный пакет изменений (LinkBatch) или None
+        self._batch = None
+        if links:
+            with self._bulk_keys():
+                for key, data in links.items():
+                    self._set(key, data)
+
+    def url_key(self, url):
+        return normalize_url(url) if self._normalize_urls else url
+
+    def _record_url_key(self, data):
+        # Записи бинарного снимка хранят уже нормализованный URL, чтобы не нормализовать его при каждом запуске
+        if self._normalize_urls and isinstance(data, SnapshotRecord) and data.url_key is not None:
+            return data.url_key
+        return self.url_key(data['url'])
+
+    def _url_index_built(self):
+        with self._lock:
+            if self._url_index is None:
+                index = UniqueIndex()
+                for key, data in self._links.items():
+                    index.add(self._record_url_key(data), key)
+                self._url_index = index
+            return self._url_index
+
+    def _index(self, key, data):
+        if self._url_index is not None:
+            self._url_index.add(self._record_url_key(data), key)
+        if self._batch is None:
+            self._index_search_and_date(key, data)
+        folded = key.casefold()
+        if self._key_index.add(folded, key):
+            if self._pending_folded_keys is not None:
+                self._pending_folded_keys.append(folded)
+            else:
+                insort(self._sorted_folded_keys, folded)
 
-def discover_plugins():
-    plugins = []
-    os.makedirs(PLUGINS_DIR, exist_ok=True) 
-    for filename in os.listdir(PLUGINS_DIR):
-        if filename.endswith('.py') and filename != 'init.py':
-            filepath = os.path.join(PLUGINS_DIR, filename)
-            spec = importlib.util.spec_from_file_location(filename[:-3], filepath)
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
+    @contextmanager
+    def _bulk_keys(self):
+        self._pending_folded_keys = []
+        try:
+            yield
+        finally:
+            pending, self._pending_folded_keys = self._pending_folded_keys, None
+            if pending:
+                self._sorted_folded_keys.extend(pending)
+                self._sorted_folded_keys.sort()
+
+    def _index_search_and_date(self, key, data):
+        if self._search_index is not None:
+            self._search_index.add(key, data)
+        elif self._search_index_changes is not None:
+            self._search_index_changes.add(key)
+        if self._search_texts is not None:
+            self._search_texts[key] = build_search_text(key, data)
+        if self._date_index is not None:
+            self._index_date(key, data)
+
+    def _unindex_search_and_date(self, key, data):
+        if self._search_index is not None:
+            self._search_index.remove(key)
+        elif self._search_index_changes is not None:
+            self._search_index_changes.add(key)
+        if self._search_texts is not None:
+            self._search_texts.pop(key, None)
+        if self._date_index is not None:
+            self._unindex_date(key)
+
+    def _unindex(self, key, data):
+        if self._url_index is not None:
+            self._url_index.remove(self._record_url_key(data), key)
+        if self._batch is None:
+            self._unindex_search_and_date(key, data)
+        folded = key.casefold()
+        if self._key_index.remove(folded, key):
+            position = bisect_left(self._sorted_folded_keys, folded)
+            del self._sorted_folded_keys[position]
+
+    def __getitem__(self, key):
+        return self._links[key]
+
+    def _set(self, key, data):
+        data = as_link(data)
+        self._remember(key)
+        if key in self._links:
+            old_data = self._links[key]
+            self._links[key] = data
+            if self._url_index is not None:
+                self._url_index.remove(self._record_url_key(old_data), key)
+                self._url_index.add(self._record_url_key(data), key)
+            if self._batch is None:
+                self._unindex_search_and_date(key, old_data)
+                self._index_search_and_date(key, data)
+            return
+        self._links[key] = data
+        self._index(key, data)
+        if self._ordinal is not None:
+            self._ordinal.append(key)
+
+    def _delete(self, key):
+        self._remember(key)
+        if self._batch is not None and self._batch.order is None:
+            self._batch.order = list(self._links)
+        data = self._links.pop(key)
+        self._unindex(key, data)
+        self._ordinal = None
+        return data
+
+    # Каждое изменение выполняется как пакет: если его не удалось сохранить, оно отменяется
+
+    def __setitem__(self, key, data):
+        with self.batch():
+            before = self._links.get(key)
+            self._set(key, data)
+            self._emit('updated' if before is not None else 'added', key, before=before, after=data)
+
+    def __delitem__(self, key):
+        with self.batch():
+            data = self._delete(key)
+            self._emit('deleted', key, before=data)
+
+    def __iter__(self):
+        return iter(self._links)
+
+    def __len__(self):
+        return len(self._links)
+
+    def __contains__(self, key):
+        return key in self._links
+
+    def keys(self):
+        return self._links.keys()
+
+    def values(self):
+        return self._links.values()
+
+    def items(self):
+        return self._links.items()
+
+    def rename(self, old_key, new_key):
+        with self.batch():
+            data = self._delete(old_key)
+            if new_key in self._links:
+                self._emit('deleted', new_key, before=self._delete(new_key))
+            self._set(new_key, data)
+            self._emit('renamed', new_key, before=data, after=data, old_key=old_key)
+
+    def add_many(self, items):
+        """Добавляет ссылки пакетом; подписчики получают одно событие 'imported'."""
+        with self.batch():
+            records = {}
+            with self._bulk_keys():
+                for key, data in items:
+                    self._set(key, data)
+                    records[key] = data
+            if records:
+                self._emit('imported', None, records=records)
+
+    def subscribe(self, listener, batched=False, required=False):
+        """
+        Подписывает listener(event) на события изменения ссылок.
+        При batched=True listener получает список событий: все события пакета сразу
+        или одно-два события одиночного изменения.
+        required=True - для сохранения изменений: такой listener вызывается до завершения
+        пакета, и его исключение отменяет изменения и передается вызывающему коду.
+        Исключения остальных подписчиков только записываются в журнал.
+        """
+        self._listeners.append((listener, batched, required))
+
+    def _dispatch(self, events, required=False):
+        for listener, batched, listener_required in self._listeners:
+            if listener_required != required:
+                continue
+            for payload in ([events] if batched else events):
+                if required:
+                    listener(payload)
+                    continue
                 try:
-                    spec.loader.exec_module(module)
-                    for name in dir(module):
-                        obj = getattr(module, name)
-                        if isinstance(obj, type) and issubclass(obj, LinkManagerPlugin) and obj != LinkManagerPlugin:
-                            plugin_info = obj.plugin_info()
-                            plugins.append({
-                                'name': plugin_info.get('name', filename[:-3]),
-                                'module': filename[:-3],
-                                'class': name,
-                                'path': filepath,
-                                'version': plugin_info.get('version', '0.1'),
-                                'description': plugin_info.get('description', 'Нет описания'),
-                                'author': plugin_info.get('author', 'Неизвестно'),
-                                'status': 'disabled'
-                            })
-                            break
+                    listener(payload)
                 except Exception as e:
-                    print(Fore.RED + f"Ошибка при загрузке плагина '{filename}': {e}")
-                    logging.error(f"Ошибка при загрузке плагина '{filename}': {e}")
-    return plugins
+                    logging.error(f"Ошибка обработчика события изменения ссылок: {e}")
+
+    def _remember(self, key):
+        # Данные ключа до начала пакета: по ним обновляются отложенные индексы и выполняется откат
+        if self._batch is not None and key not in self._batch.original:
+            self._batch.original[key] = self._links.get(key)
+
+    @contextmanager
+    def batch(self):
+        """
+        Пакет изменений. Индексы URL и ключей обновляются сразу (по ним находятся дубликаты
+        внутри пакета), а индексы поиска и дат, события подписчикам и, следовательно,
+        сохранение на диск откладываются до конца блока with. Если в блоке возникло
+        исключение или изменения не удалось сохранить, все изменения пакета отменяются.
+        Все события пакета держатся в памяти до его завершения, поэтому большой импорт
+        лучше разбивать на несколько пакетов. Пока пакет не завершен, другие потоки
+        ждут доступа к хранилищу; вложенный пакет становится частью внешнего.
+        """
+        with self._lock:
+            if self._batch is not None:
+                yield self
+                return
+            self._batch = LinkBatch(self)
+            try:
+                yield self
+                if self._batch.events:
+                    self._dispatch(self._batch.events, required=True)
+            except BaseException:
+                self._rollback()
+                raise
+            events = self._commit()
+            if events:
+                self._dispatch(events)
+
+    def _drop_indexes_built_in_batch(self, batch):
+        # Индексы, построенные внутри пакета, не учитывают его последующие изменения; они строятся заново
+        if self._search_index is not batch.search_index:
+            self._search_index = None
+        if self._search_texts is not batch.search_texts:
+            self._search_texts = None
+        if self._date_index is not batch.date_index:
+            self._date_index = None
+            self._date_values = {}
+
+    def _commit(self):
+        batch, self._batch = self._batch, None
+        self._drop_indexes_built_in_batch(batch)
+        for key, old_data in batch.original.items():
+            data = self._links.get(key)
+            if data is old_data:
+                continue
+            if old_data is not None:
+                self._unindex_search_and_date(key, old_data)
+            if data is not None:
+                self._index_search_and_date(key, data)
+        return batch.events
+
+    def _rollback(self):
+        batch = self._batch
+        # Пакет остается открытым во время отката, чтобы не трогать индексы поиска и дат:
+        # они еще соответствуют состоянию до пакета
+        for key, old_data in batch.original.items():
+            if self._links.get(key) is old_data:
+                continue
+            if key in self._links:
+                self._delete(key)
+            if old_data is not None:
+                self._set(key, old_data)
+        if batch.order is not None:
+            # Восстановленные после удаления ссылки добавились в конец: возвращаем прежний порядок
+            for key in batch.order:
+                # Ключи, добавленные в пакете до первого удаления, откат уже убрал
+                if key in self._links:
+                    self._links[key] = self._links.pop(key)
+            self._ordinal = None
+        self._batch = None
+        self._drop_indexes_built_in_batch(batch)
+        self._sequence += 1
+        logging.info(f"Пакет изменений ссылок отменен ({len(batch.original)} ключей).")
+
+    def _emit(self, change_type, key, before=None, after=None, old_key=None, records=None):
+        self._sequence += 1
+        if not self._listeners:
+            return
+        freeze = lambda data: MappingProxyType(dict(data)) if data is not None else None
+        event = LinkChangeEvent(
+            sequence=self._sequence,
+            type=change_type,
+            key=key,
+            before=freeze(before),
+            after=freeze(after),
+            old_key=old_key,
+            records=MappingProxyType({record_key: freeze(data) for record_key, data in records.items()}) if records is not None else None
+        )
+        # Изменения выполняются только внутри пакета (см. __setitem__)
+        self._batch.events.append(event)
+
+    def records(self):
+        """
+        Согласованная копия {ключ: запись} без копирования самих записей. Записи не изменяются
+        на месте, а заменяются, поэтому по тождеству (store.get(key) is record) видно,
+        менялась ли ссылка после получения копии.
+        """
+        with self._lock:
+            return dict(self._links)
+
+    def snapshot(self):
+        """Снимок всех ссылок только для чтения; пересобирается только после изменений."""
+        with self._lock:
+            if self._snapshot is None or self._snapshot[0] != self._sequence:
+                self._snapshot = (self._sequence, MappingProxyType({key: MappingProxyType(data.copy()) for key, data in self._links.items()}))
+            return self._snapshot[1]
+
+    def find_key_by_url(self, url):
+        return self._url_index_built().get(self.url_key(url))
+
+    def has_url(self, url):
+        return self.url_key(url) in self._url_index_built()
+
+    def url_keys(self):
+        """Нормализованные URL всех ссылок (представление только для чтения)."""
+        return self._url_index_built().indexed_values()
+
+    def url_key_map(self):
+        """Словарь ключ -> нормализованный URL или None, если URL не нормализуются."""
+        if not self._normalize_urls:
+            return None
+        return self._url_index_built().key_map()
+
+    def find_key(self, text):
+        """Возвращает ключ, совпадающий с text без учета регистра, или None."""
+        if text in self._links:
+            return text
+        return self._key_index.get(text.casefold())
+
+    def key_at(self, index):
+        """Возвращает ключ по порядковому номеру (с нуля) или None."""
+        if self._ordinal is None:
+            self._ordinal = list(self._links)
+        if 0 <= index < len(self._ordinal):
+            return self._ordinal[index]
+        return None
+
+    def complete_key(self, prefix, limit=10):
+        """Возвращает до limit ключей, начинающихся с prefix без учета регистра."""
+        folded_prefix = prefix.casefold()
+        position = bisect_left(self._sorted_folded_keys, folded_prefix)
+        result = []
+        for folded in self._sorted_folded_keys[position:position + limit]:
+            if not folded.startswith(folded_prefix):
+                break
+            result.append(self._key_index.get(folded))
+        return result
+
+    def suggest_keys(self, text, limit=3, window=50):
+        """
+        Подбирает похожие ключи среди соседей text в отсортированном списке ключей,
+        поэтому находит опечатки после первых символов без перебора всего хранилища.
+        """
+        folded = text.casefold()
+        position = bisect_left(self._sorted_folded_keys, folded)
+        candidates = self._sorted_folded_keys[max(0, position - window):position + window]
+        return [self._key_index.get(match) for match in difflib.get_close_matches(folded, candidates, n=limit)]
+
+    def search_keys(self, query):
+        """
+        Ключи ссылок, подходящих под запрос по ключевому слову (см. keyword_search_keys).
+        Пока индекс поиска не построен и внутри пакета изменений проверяются все ссылки.
+        """
+        with self._lock:
+            # Внутри пакета индекс еще не учитывает его изменения
+            if self._search_index is None or self._batch is not None:
+                return keyword_search_keys({key: keyword_search_text(key, data) for key, data in self._links.items()}, query)
+            return self._search_index.search(self._links, query)
+
+    def build_search_index(self):
+        """
+        Строит индекс поиска по копии ссылок, не блокируя хранилище; ссылки,
+        измененные за это время, в конце переиндексируются по текущим данным.
+        """
+        with self._lock:
+            if self._search_index is not None or self._search_index_changes is not None:
+                return
+            links = dict(self._links)
+            self._search_index_changes = set()
+        start = time.perf_counter()
+        index = SearchIndex()
+        try:
+            for key, data in links.items():
+                index.add(key, data)
+        except BaseException:
+            with self._lock:
+                self._search_index_changes = None
+            raise
+        with self._lock:
+            for key in self._search_index_changes:
+                index.remove(key)
+                if key in self._links:
+                    index.add(key, self._links[key])
+            self._search_index_changes = None
+            self._search_index = index
+        logging.info(f"Построен индекс поиска по {len(links)} ссылкам за {time.perf_counter() - start:.2f} сек.")
+
+    def start_search_index_build(self):
+        """Строит индекс поиска в фоновом потоке; до его готовности поиск перебирает все ссылки."""
+        if self._search_index is None:
+            threading.Thread(target=self.build_search_index, name="search-index", daemon=True).start()
+
+    def _index_date(self, key, data):
+        timestamp = link_timestamp(data)
+        self._date_values[key] = timestamp
+        if timestamp is not None:
+            insort(self._date_index, (timestamp, key))
+
+    def _unindex_date(self, key):
+        timestamp = self._date_values.pop(key, None)
+        if timestamp is not None:
+            position = bisect_left(self._date_index, (timestamp, key))
+            del self._date_index[position]
+
+    def keys_in_date_range(self, date_from=None, date_to=None):
+        """
+        Возвращает множество ключей, добавленных в промежутке [date_from, date_to]
+        (границы - datetime или None), и количество ссылок с нераспознанной датой.
+        """
+        if self._date_index is None:
+            self._date_index = []
+            self._date_values = {}
+            for key, data in self._links.items():
+                timestamp = link_timestamp(data)
+                self._date_values[key] = timestamp
+                if timestamp is not None:
+                    self._date_index.append((timestamp, key))
+            self._date_index.sort()
+        low = 0 if date_from is None else bisect_left(self._date_index, (date_to_timestamp(date_from),))
+        high = len(self._date_index) if date_to is None else bisect_left(self._date_index, (date_to_timestamp(date_to), chr(0x10FFFF)))
+        undated = len(self._date_values) - len(self._date_index)
+        return {key for _, key in self._date_index[low:high]}, undated
+
+    def search_texts(self):
+        """Пары (ключ, поля ссылки) для поиска по регулярному выражению."""
+        if self._search_texts is None:
+            self._search_texts = {key: build_search_text(key, data) for key, data in self._links.items()}
+        return self._search_texts.items()
+
+    def set_url_normalization(self, enabled):
+        with self._lock:
+            if enabled != self._normalize_urls:
+                self._normalize_urls = enabled
+                self._url_index = None
+
+
+# Сколько предыдущих версий файлов ссылок, настроек, статистики и конфигурации плагинов хранить
+BACKUP_COUNT = 3
+
+def backup_filename(filename, number):
+    return f"{filename}.bak{number}"
+
+def fsync_directory(directory):
+    # Нужно, чтобы переименование файла пережило сбой питания; на Windows каталоги так не открываются
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def rotate_backups(filename, backups):
+    for number in range(backups - 1, 0, -1):
+        if os.path.exists(backup_filename(filename, number)):
+            os.replace(backup_filename(filename, number), backup_filename(filename, number + 1))
+    if os.path.exists(filename):
+        try:
+            os.link(filename, backup_filename(filename, 1))
+        except OSError:
+            shutil.copy2(filename, backup_filename(filename, 1))
+
+@contextmanager
+def atomic_open(filename, mode='w', backups=0):
+    """
+    Открывает файл для записи так, чтобы на диске всегда оставалась целая версия:
+    данные пишутся во временный файл рядом, сбрасываются на диск (fsync)
+    и заменяют старый файл атомарным переименованием. При backups > 0
+    предыдущая версия сохраняется как filename.bak1, более старые сдвигаются до .bak{backups}.
+    """
+    directory = os.path.dirname(filename) or '.'
+    fd, temp_filename = tempfile.mkstemp(prefix=os.path.basename(filename) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if backups:
+            rotate_backups(filename, backups)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+        raise
+    fsync_directory(directory)
+
+def atomic_write_json(filename, data, backups=0):
+    with atomic_open(filename, backups=backups) as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+def load_json_file(filename, description):
+    """
+    Читает JSON-файл состояния. Если файл поврежден, данные берутся из самой свежей
+    целой резервной копии и сразу записываются обратно в основной файл.
+    Возвращает None, если файла нет или прочитать его не удалось.
+    """
+    if not os.path.exists(filename):
+        return None
+    for path in [filename] + [backup_filename(filename, number) for number in range(1, BACKUP_COUNT + 1)]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
+            print(Fore.RED + f"Ошибка загрузки ({description}) из '{os.path.basename(path)}': {e}.")
+            logging.error(f"Ошибка загрузки ({description}) из '{path}': {e}")
+            continue
+        if path != filename:
+            print(Fore.YELLOW + f"Данные ({description}) восстановлены из резервной копии '{os.path.basename(path)}'.")
+            logging.warning(f"Данные ({description}) восстановлены из резервной копии '{path}'.")
+            try:
+                atomic_write_json(filename, data)
+            except OSError as e:
+                logging.error(f"Не удалось перезаписать '{filename}' восстановленными данными: {e}")
+        return data
+    return None
+
+def remove_json_file(filename):
+    """Удаляет файл вместе с резервными копиями; возвращает True, если основной файл был."""
+    for number in range(1, BACKUP_COUNT + 1):
+        if os.path.exists(backup_filename(filename, number)):
+            os.remove(backup_filename(filename, number))
+    if os.path.exists(filename):
+        os.remove(filename)
+        return True
+    return False
+
+
+class SaveScheduler:
+    """
+    Откладывает сохранение на delay секунд: все запросы за это время
+    дают одну запись на диск. flush() записывает отложенное немедленно.
+    """
+
+    def __init__(self, delay=1.0):
+        self.delay = delay
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def schedule(self, name, save):
+        with self._lock:
+            self._pending[name] = save
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def cancel(self, name):
+        with self._lock:
+            self._pending.pop(name, None)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        for name, save in pending.items():
+            try:
+                save()
+            except Exception as e:
+                logging.error(f"Ошибка отложенного сохранения '{name}': {e}")
+
+save_scheduler = SaveScheduler()
+
+def save_statistics(statistics):
+    try:
+        atomic_write_json(STATISTICS_FILENAME, statistics, backups=BACKUP_COUNT)
+        logging.info("Статистика сохранена в файл.")
+    except IOError as e:
+        logging.error(f"Ошибка при сохранении статистики: {e}")
+
+def schedule_statistics_save():
+    save_scheduler.schedule('statistics', lambda: save_statistics(statistics))
+
 
 def load_plugins_config():
+    global plugins_config_cache, plugins_config_mtime
     os.makedirs(PLUGINS_DIR, exist_ok=True)
     try:
-        with open(PLUGIN_CONFIG_FILENAME, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                return config
-    except (json.JSONDecodeError, IOError) as e:
-                print(Fore.RED + f"Ошибка загрузки конфигурации плагинов: {e}")
-                logging.error(f"Ошибка загрузки конфигурации плагинов: {e}")
-    return default_plugins_config
+        mtime = os.path.getmtime(PLUGIN_CONFIG_FILENAME)
+    except OSError:
+        return {"plugins": []}
+    if plugins_config_cache is not None and mtime == plugins_config_mtime:
+        return plugins_config_cache
+    config = load_json_file(PLUGIN_CONFIG_FILENAME, "конфигурация плагинов")
+    if config is None:
+        return {"plugins": []}
+    plugins_config_cache = config
+    plugins_config_mtime = os.path.getmtime(PLUGIN_CONFIG_FILENAME)
+    return config
 
 def save_plugins_config(config):
+    global plugins_config_cache, plugins_config_mtime
     os.makedirs(PLUGINS_DIR, exist_ok=True) 
     try:
-        with open(PLUGIN_CONFIG_FILENAME, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=4)
+        atomic_write_json(PLUGIN_CONFIG_FILENAME, config, backups=BACKUP_COUNT)
+        plugins_config_cache = config
+        plugins_config_mtime = os.path.getmtime(PLUGIN_CONFIG_FILENAME)
         logging.info("Конфигурация плагинов сохранена.")
     except IOError as e:
         print(Fore.RED + f"Ошибка при сохранении конфигурации плагинов: {e}")
         logging.error(f"Ошибка при сохранении конфигурации плагинов: {e}")
 
-def save_plugins_config(config):
+def is_plugin_class(obj):
+    # Базовые классы (LinkManagerPlugin, AsyncLinkManagerPlugin, ChangeSetPlugin) абстрактные
+    return isinstance(obj, type) and issubclass(obj, LinkManagerPlugin) and not inspect.isabstract(obj)
+
+PLUGIN_INSPECTOR_SCRIPT = r'''
+import importlib.util, inspect, json, os, sys, types
+path = sys.argv[1]
+# Базовые классы передаются через stdin: плагины импортируют их из __main__ или из plugin_base
+base = types.ModuleType('plugin_base')
+exec(sys.stdin.read(), base.__dict__)
+sys.modules['plugin_base'] = base
+globals().update({k: v for k, v in base.__dict__.items() if not k.startswith('__')})
+result = {'ok': False, 'error': 'Класс плагина не найден'}
+try:
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name in dir(module):
+        obj = getattr(module, name)
+        if is_plugin_class(obj):
+            info = obj.plugin_info()
+            result = {'ok': True, 'class': name, 'info': {str(k): str(v) for k, v in dict(info).items()}}
+            break
+except BaseException as e:
+    result = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+sys.stdout.write('\n' + json.dumps(result) + '\n')
+'''
+
+def register_plugin_base_module():
+    # Как и при проверке в отдельном процессе, import plugin_base дает встроенные базовые классы:
+    # классы из отдельного файла plugin_base.py не прошли бы проверку is_plugin_class
+    module = sys.modules.get('plugin_base')
+    if getattr(module, 'LinkManagerPlugin', None) is LinkManagerPlugin:
+        return
+    module = ModuleType('plugin_base')
+    module.__dict__.update(PLUGIN_API_VERSION=PLUGIN_API_VERSION, LinkChangeEvent=LinkChangeEvent, LinkManagerPlugin=LinkManagerPlugin,
+                           AsyncLinkManagerPlugin=AsyncLinkManagerPlugin, ChangeSetPlugin=ChangeSetPlugin)
+    sys.modules['plugin_base'] = module
+
+@lru_cache(maxsize=None)
+def get_plugin_inspector_script():
+    # Класс плагина выбирается той же функцией, что и при загрузке в PluginRegistry
+    return inspect.getsource(is_plugin_class) + PLUGIN_INSPECTOR_SCRIPT
+
+@lru_cache(maxsize=None)
+def get_plugin_base_source():
+    # Базовые классы встроены в этот файл, поэтому их исходный код берется отсюда
+    header = ("import asyncio\n"
+              "from typing import Dict, Any, Optional, Mapping, Callable, NamedTuple\n"
+              "from abc import ABC, abstractmethod\n\n"
+              f"PLUGIN_API_VERSION = {PLUGIN_API_VERSION}\n\n")
+    classes = (LinkChangeEvent, LinkManagerPlugin, AsyncLinkManagerPlugin, ChangeSetPlugin)
+    return header + "\n\n".join(inspect.getsource(cls) for cls in classes)
+
+def inspect_plugin_file(filepath, timeout):
+    """Загружает плагин в отдельном процессе и возвращает описание его класса."""
     try:
-        with open(PLUGIN_CONFIG_FILENAME, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=4)
-        logging.info("Конфигурация плагинов сохранена.")
+        completed = subprocess.run(
+            [sys.executable, '-c', get_plugin_inspector_script(), filepath],
+            input=get_plugin_base_source(), capture_output=True, text=True,
+            encoding='utf-8', errors='replace', timeout=timeout, cwd=PLUGINS_DIR
+        )
+    except subprocess.TimeoutExpired:
+        return {'ok': False, 'error': f"превышено время загрузки ({timeout} с)", 'timeout': timeout}
+    except OSError as e:
+        return {'ok': False, 'error': str(e), 'retry': True}
+    lines = completed.stdout.strip().splitlines()
+    try:
+        return json.loads(lines[-1])
+    except (IndexError, json.JSONDecodeError):
+        error = completed.stderr.strip().splitlines()
+        return {'ok': False, 'error': error[-1] if error else f"код завершения {completed.returncode}"}
+
+def load_plugin_manifest():
+    try:
+        with open(PLUGIN_MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == PLUGIN_MANIFEST_VERSION:
+            return manifest.get('plugins', {})
+    except (json.JSONDecodeError, IOError, AttributeError) as e:
+        logging.debug(f"Кэш описаний плагинов не загружен: {e}")
+    return {}
+
+def save_plugin_manifest(entries):
+    try:
+        atomic_write_json(PLUGIN_MANIFEST_FILENAME, {'version': PLUGIN_MANIFEST_VERSION, 'plugins': entries})
     except IOError as e:
-        print(Fore.RED + f"Ошибка при сохранении конфигурации плагинов: {e}")
-        logging.error(f"Ошибка при сохранении конфигурации плагинов: {e}")
+        logging.error(f"Ошибка при сохранении кэша описаний плагинов: {e}")
 
+def discover_plugins():
+    plugins = []
+    os.makedirs(PLUGINS_DIR, exist_ok=True) 
+    manifest = load_plugin_manifest()
+    entries = {}
+    pending = []
+    timeout = settings.get("plugin_inspect_timeout", default_settings["plugin_inspect_timeout"])
+    for filename in sorted(os.listdir(PLUGINS_DIR)):
+        if filename.endswith('.py') and filename != 'init.py':
+            filepath = os.path.join(PLUGINS_DIR, filename)
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            entry = manifest.get(filepath)
+            # Плагин, не загрузившийся за отведенное время, проверяется снова только после
+            # изменения файла или увеличения plugin_inspect_timeout
+            if (entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size
+                    and entry.get('timeout', timeout) >= timeout):
+                entries[filepath] = entry
+            else:
+                pending.append((filename, filepath, stat))
+
+    cached_count = len(entries)
+    if pending:
+        # Новые и измененные плагины загружаются параллельно, каждый в своем процессе
+        with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(lambda item: inspect_plugin_file(item[1], timeout), pending))
+        for (filename, filepath, stat), result in zip(pending, results):
+            if not result.get('ok'):
+                print(Fore.RED + f"Ошибка при загрузке плагина '{filename}': {result.get('error')}")
+                logging.error(f"Ошибка при загрузке плагина '{filename}': {result.get('error')}")
+                if result.get('retry'):
+                    continue
+                entries[filepath] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'plugin': None, 'error': result.get('error')}
+                if 'timeout' in result:
+                    entries[filepath]['timeout'] = result['timeout']
+                continue
+            plugin_info = result['info']
+            entries[filepath] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'plugin': {
+                    'name': plugin_info.get('name', filename[:-3]),
+                    'module': filename[:-3],
+                    'class': result['class'],
+                    'path': filepath,
+                    'version': plugin_info.get('version', '0.1'),
+                    'description': plugin_info.get('description', 'Нет описания'),
+                    'author': plugin_info.get('author', 'Неизвестно'),
+                    'status': 'disabled'
+                },
+                'error': None
+            }
+        logging.info(f"Проверено плагинов: {len(pending)}, из кэша: {cached_count}")
+
+    if pending or entries.keys() != manifest.keys():
+        save_plugin_manifest(entries)
+    for filepath in sorted(entries):
+        entry = entries[filepath]
+        if entry.get('plugin'):
+            plugins.append(dict(entry['plugin']))
+        else:
+            logging.warning(f"Плагин '{filepath}' пропущен: {entry.get('error')}")
+    return plugins
 
 def manage_plugins():
     plugins_config = load_plugins_config()
@@ -197,6 +1572,8 @@ def manage_plugins():
         if not found:
             plugins_config['plugins'].append({
                 'name': plugin['name'],
+                'module': plugin['module'],
+                'class': plugin['class'],
                 'path': plugin['path'],
                 'status': 'disabled'
             })
@@ -249,7 +1626,7 @@ def manage_plugins():
                 if 0 <= index < len(plugins_config['plugins']):
                     selected_plugin_config = plugins_config['plugins'][index]
                     plugin_path = selected_plugin_config['path']
-                    # Повторно обнаруживаем плагины, чтобы получить полную информацию
+                    # Описание берется из кэша; заново загружаются только измененные файлы
                     for plugin_info in discover_plugins():
                         if plugin_info['path'] == plugin_path:
                             print(Fore.CYAN + "\nИнформация о плагине:")
@@ -267,26 +1644,265 @@ def manage_plugins():
         else:
             print(Fore.RED + "Неверный ввод.")
 
-def run_plugins(url_links: Dict[str, Dict[str, str]], action: str = None, key: str = None, **kwargs: Any):
-    plugins_config = load_plugins_config()
-    for plugin_data in plugins_config['plugins']:
+class PluginRegistry:
+    """
+    Загруженные модули и экземпляры плагинов. Модуль плагина выполняется один раз
+    и перезагружается, только если изменилось содержимое его файла.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def _find_plugin_class(module, class_name=None):
+        if class_name and hasattr(module, class_name):
+            return getattr(module, class_name)
+        for name in dir(module):
+            obj = getattr(module, name)
+            if is_plugin_class(obj):
+                return obj
+        return None
+
+    def get_instance(self, plugin_data):
+        """Возвращает экземпляр плагина или None, если плагин не удалось загрузить."""
+        path = plugin_data['path']
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry and entry['signature'] == signature:
+            return entry['instance']
+
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if entry and entry['hash'] == digest:
+            entry['signature'] = signature
+            return entry['instance']
+
+        instance = None
+        module_name = plugin_data.get('module', os.path.splitext(os.path.basename(path))[0])
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            try:
+                register_plugin_base_module()
+                spec.loader.exec_module(module)
+                plugin_class = self._find_plugin_class(module, plugin_data.get('class'))
+                if is_plugin_class(plugin_class):
+                    instance = plugin_class()
+                    logging.info(f"Плагин '{plugin_data['name']}' загружен.")
+                else:
+                    logging.error(f"В файле плагина '{path}' не найден класс плагина.")
+            except Exception as e:
+                print(Fore.RED + f"Ошибка при загрузке плагина '{plugin_data['name']}': {e}")
+                logging.error(f"Ошибка при загрузке плагина '{plugin_data['name']}': {e}")
+        # Неудачная загрузка тоже запоминается, чтобы не повторять ее до изменения файла
+        self._entries[path] = {'signature': signature, 'hash': digest, 'instance': instance}
+        return instance
+
+
+plugin_registry = PluginRegistry()
+
+
+class PluginCallTimeout(TimeoutError):
+    """Вызов плагина не уложился во время; thread - поток, в котором он продолжает выполняться."""
+
+    def __init__(self, thread):
+        super().__init__(thread.name)
+        self.thread = thread
+
+
+class PluginDispatcher:
+    """
+    Очередь вызовов плагинов, которую обслуживает пул потоков.
+    Вызовы одного плагина с ordered = True выполняются по очереди, ошибка или зависание
+    одного плагина не влияет на остальные и на основной цикл программы.
+    """
+
+    def __init__(self, max_workers):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="plugin")
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._draining = set()
+
+    def dispatch(self, name, instance, method, args, kwargs, description, on_success=None):
+        """
+        Ставит в очередь вызов instance.<method>(*args, **kwargs); description - для журнала.
+        args - кортеж или функция, которая строит его в рабочем потоке непосредственно перед вызовом.
+        on_success() выполняется в том же потоке, если вызов завершился вовремя и без ошибки.
+        """
+        job = (instance, method, args, kwargs, description, on_success)
+        if getattr(instance, 'ordered', True):
+            with self._lock:
+                self._queues.setdefault(name, deque()).append(job)
+                if name in self._draining:
+                    return
+                self._draining.add(name)
+            self._executor.submit(self._drain, name)
+        else:
+            self._executor.submit(self._call, name, *job)
+
+    def _drain(self, name):
+        while True:
+            with self._lock:
+                queue = self._queues[name]
+                if not queue:
+                    self._draining.discard(name)
+                    return
+                job = queue.popleft()
+            stuck = self._call(name, *job)
+            if stuck is not None:
+                # Следующий вызов начнется только после завершения зависшего, иначе нарушится порядок
+                threading.Thread(target=self._resume_after, args=(name, stuck), daemon=True).start()
+                return
+
+    def _resume_after(self, name, thread):
+        thread.join()
+        try:
+            self._executor.submit(self._drain, name)
+        except RuntimeError:
+            # Пул уже остановлен при выходе из программы
+            logging.warning(f"Вызовы плагина '{name}' отменены: программа завершается.")
+
+    @staticmethod
+    def _run_with_timeout(name, function, args, kwargs, timeout):
+        # Поток нельзя прервать, поэтому зависший вызов остается в фоновом daemon-потоке
+        errors = []
+
+        def target():
+            try:
+                function(*args, **kwargs)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=target, name=f"plugin-{name}", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise PluginCallTimeout(thread)
+        if errors:
+            raise errors[0]
+
+    def _call(self, name, instance, method, args, kwargs, description, on_success=None):
+        """Выполняет вызов; возвращает поток зависшего вызова, если тот не уложился во время."""
+        timeout = getattr(instance, 'timeout', None) or settings.get("plugin_timeout", default_settings["plugin_timeout"])
+        start = time.perf_counter()
+        try:
+            if callable(args):
+                args = args()
+            if method == 'run' and isinstance(instance, AsyncLinkManagerPlugin):
+                asyncio.run(asyncio.wait_for(instance.run_async(*args, **kwargs), timeout))
+            else:
+                self._run_with_timeout(name, getattr(instance, method), args, kwargs, timeout)
+            logging.debug(f"Плагин '{name}' обработал {description} за {time.perf_counter() - start:.3f} сек.")
+            if on_success is not None:
+                on_success()
+        except TimeoutError as e:
+            print(Fore.RED + f"Плагин '{name}' не ответил за {timeout} сек.")
+            logging.error(f"Плагин '{name}' превысил время ожидания ({timeout} сек.): {description}.")
+            return getattr(e, 'thread', None)
+        except Exception as e:
+            print(Fore.RED + f"Ошибка при запуске плагина '{name}': {e}")
+            logging.error(f"Ошибка при запуске плагина '{name}': {e}")
+        return None
+
+    def shutdown(self):
+        with self._lock:
+            pending = sum(len(queue) for queue in self._queues.values()) + len(self._draining)
+        if pending:
+            print(Fore.YELLOW + "Ожидание завершения плагинов...")
+        self._executor.shutdown(wait=True)
+
+
+plugin_dispatcher = None
+
+def get_plugin_dispatcher():
+    global plugin_dispatcher
+    if plugin_dispatcher is None:
+        plugin_dispatcher = PluginDispatcher(settings.get("plugin_workers", default_settings["plugin_workers"]))
+    return plugin_dispatcher
+
+def shutdown_plugin_dispatcher():
+    if plugin_dispatcher is not None:
+        plugin_dispatcher.shutdown()
+
+# Действия, о которых плагины API версии 2 узнают из событий изменения ссылок
+CHANGE_ACTIONS = ('add', 'delete', 'rename', 'import')
+
+def get_enabled_plugins():
+    for plugin_data in load_plugins_config()['plugins']:
         if plugin_data['status'] == 'enabled':
-            plugin_path = plugin_data['path']
-            module_name = plugin_data['module']
-            class_name = plugin_data['class']
-            spec = importlib.util.spec_from_file_location(module_name, plugin_path)
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                try:
-                    spec.loader.exec_module(module)
-                    if hasattr(module, class_name):
-                        plugin_class = getattr(module, class_name)
-                        if issubclass(plugin_class, LinkManagerPlugin) and plugin_class != LinkManagerPlugin:
-                            plugin_instance = plugin_class()
-                            plugin_instance.run(url_links, action, key, **kwargs)
-                except Exception as e:
-                    print(Fore.RED + f"Ошибка при запуске плагина '{plugin_data['name']}': {e}")
-                    logging.error(f"Ошибка при запуске плагина '{plugin_data['name']}': {e}")
+            try:
+                plugin_instance = plugin_registry.get_instance(plugin_data)
+            except Exception as e:
+                print(Fore.RED + f"Ошибка при запуске плагина '{plugin_data['name']}': {e}")
+                logging.error(f"Ошибка при запуске плагина '{plugin_data['name']}': {e}")
+                continue
+            if plugin_instance is not None:
+                yield plugin_data['name'], plugin_instance
+
+class PluginLinksCopy:
+    """
+    Копия ссылок для одного вызова run плагина API версии 1 - обычный словарь из обычных словарей.
+    Строится в рабочем потоке: под блокировкой хранилища копируются только ссылки на записи,
+    словари для плагина создаются уже без нее. После вызова в хранилище переносятся только ключи,
+    которые плагин изменил, и только если после создания копии их не изменил никто другой.
+    """
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        self.original = None
+        self.copies = None
+        self.links = None
+
+    def build(self):
+        self.original = self.store.records()
+        # Нетронутые копии для поиска изменений: дата в записи хранится числом, и повторный copy() дороже dict()
+        self.copies = {key: data.copy() for key, data in self.original.items()}
+        self.links = {key: dict(data) for key, data in self.copies.items()}
+        return self.links
+
+    def apply(self):
+        original, copies, links = self.original, self.copies, self.links
+        deleted = [key for key in original if key not in links]
+        changed = {key: data for key, data in links.items() if copies.get(key) != data}
+        if not deleted and not changed:
+            return
+        conflicts = 0
+        with self.store.batch():
+            for key in deleted:
+                if self.store.get(key) is original[key]:
+                    del self.store[key]
+                else:
+                    conflicts += 1
+            for key, data in changed.items():
+                if self.store.get(key) is original.get(key):
+                    self.store[key] = data
+                else:
+                    conflicts += 1
+        if conflicts:
+            logging.warning(f"Плагин '{self.name}': не применено изменений, сделанных одновременно с другими: {conflicts}.")
+        logging.info(f"Плагин '{self.name}' изменил ссылок: {len(changed)}, удалил: {len(deleted)}.")
+
+def run_plugins(url_links: LinkStore, action: str = None, key: str = None, **kwargs: Any):
+    for name, plugin_instance in get_enabled_plugins():
+        if getattr(plugin_instance, 'api_version', 1) >= 2 and action in CHANGE_ACTIONS:
+            continue
+        # run выполняется в фоновом потоке; копия ссылок для него строится там же, а не в основном цикле
+        links = PluginLinksCopy(url_links, name)
+        get_plugin_dispatcher().dispatch(
+            name, plugin_instance, 'run', lambda links=links, action=action, key=key: (links.build(), action, key),
+            kwargs, f"действие '{action}'", on_success=links.apply
+        )
+
+def notify_plugins_of_change(store, event):
+    for name, plugin_instance in get_enabled_plugins():
+        if getattr(plugin_instance, 'api_version', 1) >= 2:
+            get_plugin_dispatcher().dispatch(name, plugin_instance, 'on_change', (event, store.snapshot), {}, f"событие '{event.type}' #{event.sequence}")
+
+def attach_store_listeners(store):
+    store.subscribe(persist_link_changes, batched=True, required=True)
+    store.subscribe(lambda event: notify_plugins_of_change(store, event))
 
 
 def load_statistics():
@@ -298,71 +1914,717 @@ def load_statistics():
         "last_deleted": None
     }
     
-    if os.path.exists(STATISTICS_FILENAME):
-        try:
-            with open(STATISTICS_FILENAME, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Объединяем данные из файла с данными по умолчанию
-                for key in default_statistics.keys():
-                    if key not in data:
-                        data[key] = default_statistics[key]
-                return data
-        except (json.JSONDecodeError, IOError) as e:
-            logging.error(f"Ошибка загрузки статистики: {e}")
+    data = load_json_file(STATISTICS_FILENAME, "статистика")
+    if data is not None:
+        # Объединяем данные из файла с данными по умолчанию
+        for key in default_statistics.keys():
+            if key not in data:
+                data[key] = default_statistics[key]
+        return data
     
     return default_statistics  
 
 
+def is_sqlite_backend():
+    return settings.get("storage_backend", "json") == "sqlite"
+
+def get_db_connection():
+    global db_connection, db_fts_enabled
+    with db_lock:
+        if db_connection is None:
+            conn = sqlite3.connect(DB_FILENAME, check_same_thread=False)
+            conn.create_function("py_lower", 1, lambda value: value.lower() if value is not None else None, deterministic=True)
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS links (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    date_added TEXT,
+                    category TEXT,
+                    category_lower TEXT,
+                    description TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_links_url ON links(url);
+                CREATE INDEX IF NOT EXISTS idx_links_category ON links(category_lower);
+                CREATE INDEX IF NOT EXISTS idx_links_date_added ON links(date_added);
+                CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+            """)
+            try:
+                # trigram-токенизатор (SQLite 3.34+) позволяет искать подстроки так же, как поиск по ключевому слову
+                conn.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS links_fts USING fts5(
+                        key, url, description, content='links', content_rowid='rowid', tokenize='trigram'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS links_fts_insert AFTER INSERT ON links BEGIN
+                        INSERT INTO links_fts(rowid, key, url, description) VALUES (new.rowid, new.key, new.url, new.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS links_fts_delete AFTER DELETE ON links BEGIN
+                        INSERT INTO links_fts(links_fts, rowid, key, url, description) VALUES ('delete', old.rowid, old.key, old.url, old.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS links_fts_update AFTER UPDATE ON links BEGIN
+                        INSERT INTO links_fts(links_fts, rowid, key, url, description) VALUES ('delete', old.rowid, old.key, old.url, old.description);
+                        INSERT INTO links_fts(rowid, key, url, description) VALUES (new.rowid, new.key, new.url, new.description);
+                    END;
+                """)
+                db_fts_enabled = True
+            except sqlite3.OperationalError as e:
+                logging.warning(f"Полнотекстовый индекс FTS5 недоступен, используется поиск без индекса: {e}")
+                db_fts_enabled = False
+            db_connection = conn
+            logging.info("Открыта база данных ссылок.")
+        return db_connection
+
+def close_db_connection():
+    global db_connection
+    with db_lock:
+        if db_connection is not None:
+            db_connection.close()
+            db_connection = None
+
+def upsert_link_rows(conn, items):
+    conn.executemany(
+        """INSERT INTO links (key, url, date_added, category, category_lower, description)
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT(key) DO UPDATE SET url = excluded.url, date_added = excluded.date_added,
+               category = excluded.category, category_lower = excluded.category_lower, description = excluded.description""",
+        # Импорт из JSON/YAML может дать категорию null. Дата приводится к виду str(datetime):
+        # фильтр по дате в search_links_sql сравнивает строки
+        ((key, data['url'], normalize_date_added(data.get('date_added')), data.get('category'), (data.get('category') or '').lower(),
+          data.get('description'))
+         for key, data in items)
+    )
+
+def apply_changes_to_db(entries):
+    conn = get_db_connection()
+    with db_lock, conn:
+        for entry in entries:
+            if entry['action'] == 'set':
+                upsert_link_rows(conn, [(entry['key'], entry['data'])])
+            elif entry['action'] == 'delete':
+                conn.execute("DELETE FROM links WHERE key = ?", (entry['key'],))
+            elif entry['action'] == 'rename':
+                conn.execute("DELETE FROM links WHERE key = ?", (entry['new_key'],))
+                conn.execute("UPDATE links SET key = ? WHERE key = ?", (entry['new_key'], entry['key']))
+
+def write_all_links_to_db(links):
+    conn = get_db_connection()
+    with db_lock, conn:
+        conn.execute("DELETE FROM links")
+        upsert_link_rows(conn, links.items())
+        conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('migrated_from_json', ?)", (str(datetime.now()),))
+        conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('dates_normalized', ?)", (str(datetime.now()),))
+    logging.info(f"В базу данных записано ссылок: {len(links)}.")
+
+def normalize_db_dates(conn):
+    # Базы, перенесенные из JSON до нормализации дат, могли сохранить даты вида дд.мм.гггг
+    with db_lock, conn:
+        rows = conn.execute("SELECT key, date_added FROM links").fetchall()
+        changed = [(normalize_date_added(date_added), key) for key, date_added in rows if normalize_date_added(date_added) != date_added]
+        conn.executemany("UPDATE links SET date_added = ? WHERE key = ?", changed)
+        conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('dates_normalized', ?)", (str(datetime.now()),))
+    if changed:
+        logging.info(f"В базе данных приведены к единому виду даты добавления: {len(changed)}.")
+
+def load_links_from_db():
+    conn = get_db_connection()
+    with db_lock:
+        migrated = conn.execute("SELECT value FROM meta WHERE name = 'migrated_from_json'").fetchone()
+    if not migrated:
+        # Однократный перенос ссылок из JSON-файла и журнала
+        links = load_links_from_json()
+        write_all_links_to_db(links)
+        print(Fore.GREEN + f"Ссылки перенесены в базу данных SQLite: {len(links)}.")
+        logging.info(f"Ссылки перенесены из JSON в SQLite: {len(links)}.")
+        return links
+    with db_lock:
+        normalized = conn.execute("SELECT value FROM meta WHERE name = 'dates_normalized'").fetchone()
+    if not normalized:
+        normalize_db_dates(conn)
+    with db_lock:
+        rows = conn.execute("SELECT key, url, date_added, category, description FROM links ORDER BY rowid").fetchall()
+    logging.info("Ссылки загружены из базы данных.")
+    return {key: {"url": url, "date_added": date_added, "category": category, "description": description} for key, url, date_added, category, description in rows}
+
+def switch_storage_backend(links):
+    global journal_record_count
+    if is_sqlite_backend():
+        if not save_links(links):
+            print(Fore.RED + "Хранилище ссылок не изменено.")
+            return
+        settings["storage_backend"] = "json"
+        close_db_connection()
+    else:
+        write_all_links_to_db(links)
+        wait_for_journal_compaction()
+        save_links(links)
+        for filename in (JOURNAL_FILENAME, JOURNAL_COMPACTING_FILENAME):
+            if os.path.exists(filename):
+                os.remove(filename)
+        journal_record_count = 0
+        settings["storage_backend"] = "sqlite"
+    save_settings(settings)
+    print(Fore.GREEN + f"Хранилище ссылок изменено на: {settings['storage_backend'].upper()}.")
+    logging.info(f"Хранилище ссылок изменено на: {settings['storage_backend']}.")
+
+def toggle_binary_snapshot():
+    settings["binary_snapshot"] = not settings["binary_snapshot"]
+    save_settings(settings)
+    if settings["binary_snapshot"]:
+        if not is_sqlite_backend():
+            # Снимок записывается вместе с url_links.json, поэтому сразу сжимаем журнал
+            with url_links._lock, journal_lock:
+                start_journal_compaction()
+            wait_for_journal_compaction()
+        print(Fore.GREEN + "Бинарный снимок ссылок включен.")
+    else:
+        remove_links_snapshot()
+        print(Fore.GREEN + "Бинарный снимок ссылок выключен.")
+    logging.info(f"Бинарный снимок ссылок {'включен' if settings['binary_snapshot'] else 'выключен'}.")
+
+def link_url_exists(links, url):
+    if isinstance(links, LinkStore):
+        return links.has_url(url)
+    return url in [link['url'] for link in links.values()]
+
+def replay_journal(links, filename):
+    count = 0
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Последняя запись могла быть записана не полностью при аварийном завершении
+                logging.warning(f"Пропущена поврежденная запись журнала в '{filename}'.")
+                continue
+            action = entry.get('action')
+            key = entry.get('key')
+            if action == 'set':
+                links[key] = entry['data']
+            elif action == 'delete':
+                links.pop(key, None)
+            elif action == 'rename':
+                if key in links:
+                    links[entry['new_key']] = links.pop(key)
+            else:
+                logging.warning(f"Неизвестное действие в журнале: '{action}'.")
+                continue
+            count += 1
+    return count
+
 def load_links():
-    if os.path.exists(LINKS_FILENAME):
-        try:
-            with open(LINKS_FILENAME, 'r', encoding='utf-8') as f:
-                links = json.load(f)
-                for key, value in links.items():
-                    if isinstance(value, str):
-                        links[key] = {"url": value, "date_added": str(datetime.now()), "category": "Без категории", "description": ""}
-                    elif "category" not in value:
-                        value["category"] = "Без категории"
-                        value["description"] = ""
-                    elif "description" not in value:
-                        value["description"] = ""
-                logging.info("Ссылки загружены из файла.")
-                return links
-        except (json.JSONDecodeError, IOError) as e:
-            print(Fore.RED + f"Ошибка загрузки ссылок: {e}.")
-            logging.error(f"Ошибка загрузки ссылок: {e}")
-    logging.info("Загружены стандартные ссылки.")
-    return default_links.copy()
+    if is_sqlite_backend():
+        links = load_links_from_db()
+    else:
+        links = load_links_from_json()
+    store = LinkStore(links, normalize_urls=settings.get("normalize_urls", False))
+    if not is_sqlite_backend():
+        # В SQLite поиск по ключевому слову выполняет сама база
+        store.start_search_index_build()
+    return store
+
+def migrate_link_records(links):
+    # Записи бинарного снимка уже приведены к текущей схеме при его записи
+    for key, value in links.items():
+        if isinstance(value, SnapshotRecord):
+            continue
+        if isinstance(value, str):
+            links[key] = {"url": value, "date_added": str(datetime.now()), "category": "Без категории", "description": ""}
+        elif "category" not in value:
+            value["category"] = "Без категории"
+            value["description"] = ""
+        elif "description" not in value:
+            value["description"] = ""
+
+def load_links_from_json():
+    global journal_record_count
+    links = None
+    if settings.get("binary_snapshot"):
+        links = load_links_snapshot()
+    if links is None:
+        links = load_json_file(LINKS_FILENAME, "ссылки")
+        if links is not None:
+            logging.info("Ссылки загружены из файла.")
+            if settings.get("binary_snapshot"):
+                # Схема обновляется один раз - при создании бинарного снимка; он соответствует JSON без журнала
+                migrate_link_records(links)
+                write_links_snapshot(links)
+    snapshot_missing = links is None
+    if snapshot_missing:
+        logging.info("Загружены стандартные ссылки.")
+        links = default_links.copy()
+
+    # Изменения, сделанные после последнего снимка, восстанавливаются из журнала
+    replayed = 0
+    interrupted_compaction = os.path.exists(JOURNAL_COMPACTING_FILENAME)
+    for filename in (JOURNAL_COMPACTING_FILENAME, JOURNAL_FILENAME):
+        if os.path.exists(filename):
+            try:
+                replayed += replay_journal(links, filename)
+            except IOError as e:
+                print(Fore.RED + f"Ошибка чтения журнала изменений: {e}.")
+                logging.error(f"Ошибка чтения журнала изменений '{filename}': {e}")
+    if replayed:
+        logging.info(f"Из журнала применено изменений: {replayed}.")
+
+    migrate_link_records(links)
+
+    if interrupted_compaction or (snapshot_missing and replayed):
+        # Прерванное сжатие завершаем сразу, чтобы не потерять записи при следующем сжатии,
+        # а стандартные ссылки сохраняем, чтобы журнал применялся к тем же данным.
+        # Если снимок не записан, журналы остаются и будут применены при следующем запуске
+        if save_links(links):
+            for filename in (JOURNAL_COMPACTING_FILENAME, JOURNAL_FILENAME):
+                if os.path.exists(filename):
+                    os.remove(filename)
+            journal_record_count = 0
+        else:
+            journal_record_count = replayed
+    else:
+        journal_record_count = replayed
+    return links
+
+def plain_links(links):
+    # json и yaml сериализуют только обычные словари, а записи хранилища (Link, SnapshotRecord) - отображения;
+    # copy() у них, как и у dict, возвращает обычный словарь
+    return {key: data.copy() for key, data in links.items()}
 
-def save_links(links):
+def save_links(links, url_keys=None):
+    """Сохраняет снимок ссылок; возвращает False, если url_links.json записать не удалось."""
     try:
-        with open(LINKS_FILENAME, 'w', encoding='utf-8') as f:
-            json.dump(links, f, ensure_ascii=False, indent=4)
+        atomic_write_json(LINKS_FILENAME, plain_links(links), backups=BACKUP_COUNT)
         logging.info("Ссылки сохранены в файл.")
     except IOError as e:
         print(Fore.RED + f"Ошибка при сохранении ссылок: {e}.")
         logging.error(f"Ошибка при сохранении ссылок: {e}")
+        return False
+    if settings.get("binary_snapshot"):
+        if url_keys is None and isinstance(links, LinkStore):
+            url_keys = links.url_key_map()
+        write_links_snapshot(links, url_keys)
+    return True
+
+
+# Бинарный снимок: заголовок, затем записи (длины и UTF-8 полей date_added, category, description
+# и JSON прочих полей), затем индекс: смещения записей, длины и тексты ключей, URL
+# и, если в заголовке есть флаг SNAPSHOT_URL_KEYS, нормализованных URL.
+# Снимок повторяет url_links.json на момент записи и отмечен его размером и временем изменения,
+# поэтому устаревший снимок (например, после восстановления JSON из резервной копии) не используется.
+SNAPSHOT_MAGIC = b'LMSNAP01'
+SNAPSHOT_HEADER = struct.Struct('<8sQqQQQ')  # сигнатура, размер JSON, mtime_ns JSON, число записей, смещение индекса, флаги
+SNAPSHOT_URL_KEYS = 1
+SNAPSHOT_RECORD = struct.Struct('<4I')
+SNAPSHOT_FIELDS = ('date_added', 'category', 'description')
+SNAPSHOT_NONE = 0xFFFFFFFF
+SNAPSHOT_MISSING = 0xFFFFFFFE
+
+def json_file_stamp(filename):
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+def snapshot_array(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+def snapshot_strings(data, lengths):
+    text = data.decode('utf-8')
+    strings = []
+    position = 0
+    for length in lengths:
+        strings.append(text[position:position + length])
+        position += length
+    return strings
+
+
+class SnapshotRecord(MutableMapping):
+    """
+    Данные ссылки из бинарного снимка. URL известен сразу (он нужен индексам хранилища),
+    остальные поля декодируются из отображенного в память файла при первом обращении.
+    """
+    __slots__ = ('_snapshot', '_offset', '_url', '_data', 'url_key')
+
+    def __init__(self, snapshot, offset, url, url_key=None):
+        self._snapshot = snapshot
+        self._offset = offset
+        self._url = url
+        self._data = None
+        self.url_key = url_key
+
+    def _load(self):
+        data = self._data
+        if data is None:
+            data = self._snapshot.decode(self)
+        return data
 
-def load_settings():
-    if os.path.exists(SETTINGS_FILENAME):
+    def __getitem__(self, name):
+        if name == 'url' and self._data is None:
+            return self._url
+        return self._load()[name]
+
+    def __setitem__(self, name, value):
+        if name == 'url':
+            self.url_key = None
+        self._load()[name] = value
+
+    def __delitem__(self, name):
+        if name == 'url':
+            self.url_key = None
+        del self._load()[name]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __repr__(self):
+        return repr(self._load())
+
+    def copy(self):
+        return self._load().copy()
+
+
+class LinkSnapshot:
+    """Бинарный снимок ссылок, отображенный в память."""
+
+    def __init__(self, filename):
+        self._lock = threading.Lock()
+        self._records = []
+        with open(filename, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         try:
-            with open(SETTINGS_FILENAME, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                for key, value in default_settings.items():
-                    if key not in settings:
-                        settings[key] = value
-                logging.info("Настройки загружены из файла.")
-                return settings
-        except (json.JSONDecodeError, IOError) as e:
-            print(Fore.RED + f"Ошибка загрузки настроек: {e}.")
-            logging.error(f"Ошибка загрузки настроек: {e}")
+            magic, json_size, json_mtime_ns, count, index_offset, flags = SNAPSHOT_HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError("файл слишком короткий")
+        if magic != SNAPSHOT_MAGIC:
+            self._mmap.close()
+            raise ValueError("неизвестный формат файла")
+        self.json_stamp = (json_size, json_mtime_ns)
+        self.count = count
+        self._index_offset = index_offset
+        self._flags = flags
+
+    def load(self):
+        """Возвращает {ключ: SnapshotRecord}; читаются только индекс, ключи и URL."""
+        mm = self._mmap
+        count = self.count
+        has_url_keys = bool(self._flags & SNAPSHOT_URL_KEYS)
+        position = self._index_offset
+        offsets = snapshot_array('Q', mm[position:position + 8 * count])
+        position += 8 * count
+        lengths = []
+        for _ in range(3 if has_url_keys else 2):
+            lengths.append(snapshot_array('I', mm[position:position + 4 * count]))
+            position += 4 * count
+        sizes = struct.unpack_from('<QQQ', mm, position)
+        position += 24
+        if len(offsets) != count or any(len(values) != count for values in lengths) or position + sum(sizes) != len(mm):
+            raise ValueError("поврежден индекс")
+        columns = []
+        for size, column_lengths in zip(sizes, lengths):
+            columns.append(snapshot_strings(mm[position:position + size], column_lengths))
+            position += size
+        keys, urls = columns[0], columns[1]
+        url_keys = columns[2] if has_url_keys else repeat(None)
+        self._records = [SnapshotRecord(self, offset, url, url_key) for offset, url, url_key in zip(offsets, urls, url_keys)]
+        return dict(zip(keys, self._records))
+
+    def _decode_field(self, position, length):
+        if length == SNAPSHOT_NONE:
+            return None, position
+        return str(self._mmap[position:position + length], 'utf-8'), position + length
+
+    def decode(self, record):
+        with self._lock:
+            if record._data is None:
+                lengths = SNAPSHOT_RECORD.unpack_from(self._mmap, record._offset)
+                position = record._offset + SNAPSHOT_RECORD.size
+                data = {"url": record._url}
+                for name, length in zip(SNAPSHOT_FIELDS, lengths):
+                    if length != SNAPSHOT_MISSING:
+                        data[name], position = self._decode_field(position, length)
+                if lengths[3]:
+                    data.update(json.loads(str(self._mmap[position:position + lengths[3]], 'utf-8')))
+                record._data = Link(data)
+            return record._data
+
+    def close(self):
+        """
+        Закрывает отображение файла. Еще не прочитанные записи сначала декодируются:
+        на Windows отображенный файл нельзя заменить или удалить.
+        """
+        with self._lock:
+            if self._mmap.closed:
+                return
+        for record in self._records:
+            record._load()
+        with self._lock:
+            self._records = []
+            self._mmap.close()
+
+
+def encode_snapshot_record(data):
+    lengths = []
+    fields = []
+    for name in SNAPSHOT_FIELDS:
+        value = data.get(name)
+        if name not in data or not (value is None or isinstance(value, str)):
+            lengths.append(SNAPSHOT_MISSING)
+        elif value is None:
+            lengths.append(SNAPSHOT_NONE)
+        else:
+            encoded = value.encode('utf-8')
+            lengths.append(len(encoded))
+            fields.append(encoded)
+    # Поля, которые добавили плагины, и нестроковые значения сохраняются как JSON
+    extra = {name: value for name, value in data.items()
+             if name != 'url' and (name not in SNAPSHOT_FIELDS or not (value is None or isinstance(value, str)))}
+    extra = json.dumps(extra, ensure_ascii=False).encode('utf-8') if extra else b''
+    lengths.append(len(extra))
+    fields.append(extra)
+    return SNAPSHOT_RECORD.pack(*lengths) + b''.join(fields)
+
+def write_links_snapshot(links, url_keys=None):
+    """
+    Записывает бинарный снимок ссылок рядом с url_links.json, который уже сохранен на диск.
+    url_keys - словарь ключ -> нормализованный URL (LinkStore.url_key_map); если он передан,
+    нормализованные URL сохраняются в снимке и не вычисляются заново при загрузке.
+    Вызывается при сохранении снимка ссылок, в том числе из потока сжатия журнала.
+    """
+    global links_snapshot
+    with links_snapshot_lock:
+        if links_snapshot is not None:
+            links_snapshot.close()
+            links_snapshot = None
+        try:
+            json_size, json_mtime_ns = json_file_stamp(LINKS_FILENAME)
+            offsets = array('Q')
+            columns = [[], []] if url_keys is None else [[], [], []]
+            with atomic_open(SNAPSHOT_FILENAME, 'wb') as f:
+                f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 0, 0, 0, 0, 0))
+                position = SNAPSHOT_HEADER.size
+                for key, data in links.items():
+                    url = data['url']
+                    if not isinstance(url, str):
+                        raise ValueError(f"URL ссылки '{key}' не является строкой")
+                    record = encode_snapshot_record(data)
+                    f.write(record)
+                    offsets.append(position)
+                    position += len(record)
+                    columns[0].append(key)
+                    columns[1].append(url)
+                    if url_keys is not None:
+                        url_key = url_keys.get(key)
+                        columns[2].append(url_key if url_key is not None else normalize_url(url))
+                index = [offsets] + [array('I', map(len, column)) for column in columns]
+                for values in index:
+                    if sys.byteorder == 'big':
+                        values.byteswap()
+                    f.write(values.tobytes())
+                blobs = [''.join(column).encode('utf-8') for column in columns]
+                f.write(struct.pack('<QQQ', *(len(blob) for blob in blobs), *([0] * (3 - len(blobs)))))
+                for blob in blobs:
+                    f.write(blob)
+                f.seek(0)
+                flags = SNAPSHOT_URL_KEYS if url_keys is not None else 0
+                f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, json_size, json_mtime_ns, len(offsets), position, flags))
+        except (IOError, ValueError) as e:
+            print(Fore.RED + f"Ошибка при сохранении бинарного снимка ссылок: {e}.")
+            logging.error(f"Ошибка при сохранении бинарного снимка ссылок: {e}")
+            return
+    logging.info(f"Бинарный снимок ссылок сохранен ({len(offsets)} ссылок).")
+
+def load_links_snapshot():
+    """
+    Открывает бинарный снимок, если он соответствует текущему url_links.json.
+    Возвращает {ключ: SnapshotRecord} или None, если снимка нет или он устарел.
+    """
+    global links_snapshot
+    if not os.path.exists(SNAPSHOT_FILENAME) or not os.path.exists(LINKS_FILENAME):
+        return None
+    with links_snapshot_lock:
+        if links_snapshot is not None:
+            links_snapshot.close()
+            links_snapshot = None
+        try:
+            snapshot = LinkSnapshot(SNAPSHOT_FILENAME)
+        except (IOError, ValueError) as e:
+            logging.warning(f"Бинарный снимок ссылок не прочитан: {e}. Ссылки загружаются из JSON.")
+            return None
+        try:
+            if snapshot.json_stamp != json_file_stamp(LINKS_FILENAME):
+                logging.info("Бинарный снимок ссылок устарел, ссылки загружаются из JSON.")
+                snapshot.close()
+                return None
+            links = snapshot.load()
+        except (IOError, ValueError, struct.error) as e:
+            logging.warning(f"Бинарный снимок ссылок поврежден: {e}. Ссылки загружаются из JSON.")
+            snapshot.close()
+            return None
+        links_snapshot = snapshot
+    logging.info(f"Ссылки загружены из бинарного снимка ({len(links)} ссылок).")
+    return links
+
+def close_links_snapshot():
+    global links_snapshot
+    with links_snapshot_lock:
+        if links_snapshot is not None:
+            links_snapshot.close()
+            links_snapshot = None
+
+def remove_links_snapshot():
+    close_links_snapshot()
+    if os.path.exists(SNAPSHOT_FILENAME):
+        os.remove(SNAPSHOT_FILENAME)
+        return True
+    return False
+
+def record_link_changes(entries):
+    """
+    Дописывает изменения ссылок в журнал одной записью на диск.
+    Каждое изменение - словарь с ключами 'action' ('set', 'delete' или 'rename'),
+    'key' и, в зависимости от действия, 'data' или 'new_key'.
+    Если изменения сохранить не удалось, выбрасывает IOError.
+    """
+    global journal_record_count
+    if not entries:
+        return
+    if is_sqlite_backend():
+        try:
+            apply_changes_to_db(entries)
+        except sqlite3.Error as e:
+            logging.error(f"Ошибка при сохранении ссылок в базу данных: {e}")
+            raise IOError(f"база данных: {e}") from e
+        return
+    # Вызывается внутри пакета изменений, так что блокировка хранилища уже захвачена этим потоком
+    with url_links._lock, journal_lock:
+        try:
+            with open(JOURNAL_FILENAME, 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=dict) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except IOError as e:
+            print(Fore.RED + f"Ошибка при записи журнала изменений: {e}. Сохраняем все ссылки.")
+            logging.error(f"Ошибка при записи журнала изменений: {e}")
+            # url_links уже содержит эти изменения: пакет завершается только после сохранения
+            if not save_links(url_links):
+                raise
+            return
+        journal_record_count += len(entries)
+        logging.debug(f"В журнал записано изменений: {len(entries)}.")
+        if journal_compaction_deferred == 0 and \
+                journal_record_count >= settings.get("journal_max_records", default_settings["journal_max_records"]):
+            start_journal_compaction()
+
+def persist_link_changes(events):
+    """
+    Обязательный подписчик LinkStore: сохраняет изменения ссылок в журнал (или базу данных).
+    Пакет изменений записывается одной записью на диск; если записать его не удалось,
+    исключение отменяет пакет.
+    """
+    entries = []
+    for event in events:
+        if event.type in ('added', 'updated'):
+            entries.append({"action": "set", "key": event.key, "data": event.after})
+        elif event.type == 'deleted':
+            entries.append({"action": "delete", "key": event.key})
+        elif event.type == 'renamed':
+            entries.append({"action": "rename", "key": event.old_key, "new_key": event.key})
+        elif event.type == 'imported':
+            entries.extend({"action": "set", "key": key, "data": data} for key, data in event.records.items())
+    record_link_changes(entries)
+
+def start_journal_compaction():
+    """
+    Запускает сжатие журнала в фоне. Вызывается при захваченных блокировке хранилища url_links
+    и journal_lock (именно в этом порядке, как в record_link_changes, который выполняется внутри
+    пакета изменений): снимок ссылок не должен застать незавершенный пакет.
+    """
+    global journal_record_count, compaction_thread
+    if compaction_thread is not None and compaction_thread.is_alive():
+        return
+    # Снимок и переименование журнала делаются вместе, поэтому снимок содержит все записи из переименованного журнала
+    snapshot = plain_links(url_links)
+    url_keys = url_links.url_key_map() if settings.get("binary_snapshot") else None
+    if os.path.exists(JOURNAL_FILENAME):
+        if os.path.exists(JOURNAL_COMPACTING_FILENAME):
+            # Предыдущее сжатие не смогло записать снимок: его журнал дополняется, а не заменяется
+            with open(JOURNAL_FILENAME, 'rb') as source, open(JOURNAL_COMPACTING_FILENAME, 'ab') as target:
+                shutil.copyfileobj(source, target)
+                target.flush()
+                os.fsync(target.fileno())
+            os.remove(JOURNAL_FILENAME)
+        else:
+            os.replace(JOURNAL_FILENAME, JOURNAL_COMPACTING_FILENAME)
+    journal_record_count = 0
+
+    def compact():
+        if not save_links(snapshot, url_keys):
+            # Журнал остается: его применит следующий запуск или следующее сжатие
+            logging.error("Журнал изменений не сжат: снимок ссылок не сохранен.")
+            return
+        try:
+            os.remove(JOURNAL_COMPACTING_FILENAME)
+        except OSError:
+            pass
+        logging.info(f"Журнал изменений сжат, в снимок записано {len(snapshot)} ссылок.")
+
+    compaction_thread = threading.Thread(target=compact, name="journal-compaction")
+    compaction_thread.start()
+
+def wait_for_journal_compaction():
+    if compaction_thread is not None:
+        compaction_thread.join()
+
+@contextmanager
+def deferred_journal_compaction():
+    """Откладывает сжатие журнала до конца блока, например на время импорта, сохраняемого по пачкам."""
+    global journal_compaction_deferred
+    with journal_lock:
+        journal_compaction_deferred += 1
+    try:
+        yield
+    finally:
+        with url_links._lock, journal_lock:
+            journal_compaction_deferred -= 1
+            if journal_compaction_deferred == 0 and not is_sqlite_backend() and \
+                    journal_record_count >= settings.get("journal_max_records", default_settings["journal_max_records"]):
+                start_journal_compaction()
+
+def remove_links_files():
+    wait_for_journal_compaction()
+    close_db_connection()
+    removed = False
+    if remove_json_file(LINKS_FILENAME):
+        removed = True
+    if remove_links_snapshot():
+        removed = True
+    for filename in (JOURNAL_FILENAME, JOURNAL_COMPACTING_FILENAME, DB_FILENAME):
+        if os.path.exists(filename):
+            os.remove(filename)
+            removed = True
+    return removed
+
+def load_settings():
+    settings = load_json_file(SETTINGS_FILENAME, "настройки")
+    if settings is not None:
+        for key, value in default_settings.items():
+            if key not in settings:
+                settings[key] = value
+        logging.info("Настройки загружены из файла.")
+        return settings
     logging.info("Загружены стандартные настройки.")
     return default_settings.copy()
 
 def save_settings(settings):
     try:
-        with open(SETTINGS_FILENAME, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, ensure_ascii=False, indent=4)
+        atomic_write_json(SETTINGS_FILENAME, settings, backups=BACKUP_COUNT)
         logging.info("Настройки сохранены в файл.")
     except IOError as e:
         print(Fore.RED + f"Ошибка при сохранении настроек: {e}.")
@@ -374,55 +2636,311 @@ def open_browser(url):
         print(Fore.GREEN + f"Открываем: {url}")
         logging.info(f"Открыта ссылка: {url}")
         statistics["last_opened"] = str(datetime.now())  
+        schedule_statistics_save()
     except Exception as e:
         print(Fore.RED + f"Ошибка при открытии браузера: {e}")
         logging.error(f"Ошибка при открытии браузера: {e}")
 
+URL_PATTERN = re.compile(
+    r'^(?:http|ftp)s?://'  
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  
+    r'localhost|'  
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'  
+    r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'  
+    r'(?::\d+)?'  
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+# Грубая проверка: схема, :// и ни одного пробельного символа. Все, что не проходит ее, не пройдет и полную проверку
+URL_PREFILTER_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*://\S+$')
+
 def is_valid_url_regex(url):
-    regex = re.compile(
-        r'^(?:http|ftp)s?://'  
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  
-        r'localhost|'  
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'  
-        r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'  
-        r'(?::\d+)?'  
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return re.match(regex, url) is not None
+    return URL_PATTERN.match(url) is not None
 
-def is_valid_url(url):
-    if settings["use_validators"] and not validators.url(url):
+def url_is_valid(url, use_validators, use_regex):
+    # Не обращается к settings, поэтому может выполняться в дочернем процессе
+    if not isinstance(url, str) or not url:
+        return False
+    if use_validators and not validators.url(url):
         return False
-    if settings["use_regex"] and not is_valid_url_regex(url):
+    if use_regex and not is_valid_url_regex(url):
         return False
-    return True  
+    return True
+
+def validate_url_chunk(urls, use_validators, use_regex):
+    return [url_is_valid(url, use_validators, use_regex) for url in urls]
+
+def validation_worker_count():
+    if validation_pool_disabled:
+        return 1
+    return settings.get("validation_workers") or os.cpu_count() or 1
+
+def get_validation_pool():
+    global validation_pool
+    if validation_pool is None:
+        workers = validation_worker_count()
+        if workers < 2:
+            return None
+        validation_pool = ProcessPoolExecutor(max_workers=workers)
+        logging.info(f"Запущен пул проверки URL: {workers} процессов.")
+    return validation_pool
+
+def shutdown_validation_pool():
+    global validation_pool
+    if validation_pool is not None:
+        validation_pool.shutdown()
+        validation_pool = None
+
+def validate_urls_in_processes(urls, use_validators, use_regex):
+    global validation_pool_disabled
+    pool = get_validation_pool()
+    if pool is None:
+        return validate_url_chunk(urls, use_validators, use_regex)
+    chunk_size = max(500, len(urls) // (validation_worker_count() * 4) + 1)
+    chunks = [urls[i:i + chunk_size] for i in range(0, len(urls), chunk_size)]
+    try:
+        results = []
+        for chunk_results in pool.map(validate_url_chunk, chunks, repeat(use_validators), repeat(use_regex)):
+            results.extend(chunk_results)
+        return results
+    except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+        logging.warning(f"Пул проверки URL недоступен ({e}), проверка продолжается в основном процессе.")
+        shutdown_validation_pool()
+        # Только до конца сеанса: настройка validation_workers не меняется и не сохраняется
+        validation_pool_disabled = True
+        return validate_url_chunk(urls, use_validators, use_regex)
+
+def validate_urls(urls):
+    """
+    Проверяет список URL по текущим настройкам и возвращает список bool той же длины.
+    Уже проверенные URL берутся из памяти, а большие пачки новых URL
+    проверяются в нескольких процессах.
+    """
+    flags = (settings["use_validators"], settings["use_regex"])
+    memo = url_validation_memo.get(flags)
+    if memo is None:
+        memo = url_validation_memo[flags] = {}
+    pending = list({url for url in urls if isinstance(url, str) and url not in memo})
+    if pending:
+        threshold = settings.get("validation_process_threshold", default_settings["validation_process_threshold"])
+        if threshold and len(pending) >= threshold:
+            results = validate_urls_in_processes(pending, *flags)
+        else:
+            results = validate_url_chunk(pending, *flags)
+        if len(memo) + len(pending) > URL_VALIDATION_MEMO_LIMIT:
+            memo.clear()
+        memo.update(zip(pending, results))
+    return [memo.get(url, False) if isinstance(url, str) else False for url in urls]
+
+def is_valid_url(url):
+    return validate_urls([url])[0]
+
+def load_health_cache():
+    if os.path.exists(HEALTH_CACHE_FILENAME):
+        try:
+            with open(HEALTH_CACHE_FILENAME, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+                logging.info(f"Кэш доступности ссылок загружен: {len(cache)} записей.")
+                return cache
+        except (json.JSONDecodeError, IOError) as e:
+            logging.error(f"Ошибка загрузки кэша доступности ссылок: {e}")
+    return {}
+
+def save_health_cache():
+    max_entries = settings.get("health_cache_max_entries", default_settings["health_cache_max_entries"])
+    with health_cache_lock:
+        if len(health_cache) > max_entries:
+            # Вытесняем записи, которые проверялись давнее всего
+            newest = sorted(health_cache.items(), key=lambda item: item[1]['checked_at'], reverse=True)[:max_entries]
+            health_cache.clear()
+            health_cache.update(newest)
+        snapshot = dict(health_cache)
+    try:
+        atomic_write_json(HEALTH_CACHE_FILENAME, snapshot)
+        logging.info("Кэш доступности ссылок сохранен в файл.")
+    except IOError as e:
+        logging.error(f"Ошибка при сохранении кэша доступности ссылок: {e}")
+
+def clear_health_cache():
+    with health_cache_lock:
+        health_cache.clear()
+    save_health_cache()
+    print(Fore.GREEN + "Кэш доступности ссылок очищен.")
+    logging.info("Кэш доступности ссылок очищен.")
+
+def is_health_entry_fresh(entry):
+    if entry['accessible']:
+        ttl = settings.get("health_cache_ttl", default_settings["health_cache_ttl"])
+    else:
+        ttl = settings.get("health_cache_negative_ttl", default_settings["health_cache_negative_ttl"])
+    return time.time() - entry['checked_at'] < ttl
+
+def get_http_session():
+    global http_session
+    with http_session_lock:
+        if http_session is None:
+            retry = urllib3_retry.Retry(
+                total=settings.get("http_retries", default_settings["http_retries"]),
+                backoff_factor=settings.get("http_backoff_factor", default_settings["http_backoff_factor"]),
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['HEAD', 'GET']),
+                raise_on_status=False
+            )
+            pool_size = settings.get("check_max_workers", default_settings["check_max_workers"])
+            adapter = requests_adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = 'LinkManager/3.1.1'
+            http_session = session
+            logging.info("Создана HTTP-сессия для проверки ссылок.")
+        return http_session
+
+def probe_url(url, headers=None):
+    """
+    Проверяет URL запросом HEAD, а если сервер его не поддерживает - запросом GET
+    в потоковом режиме без чтения тела ответа. Редиректы не выполняются.
+    """
+    session = get_http_session()
+    timeout = settings.get("http_timeout", default_settings["http_timeout"])
+    response = session.head(url, timeout=timeout, headers=headers, allow_redirects=False)
+    response.close()
+    if response.status_code in HEAD_FALLBACK_STATUSES:
+        logging.debug(f"URL '{url}' не поддерживает HEAD (статус {response.status_code}), выполняется GET.")
+        response = session.get(url, timeout=timeout, headers=headers, allow_redirects=False, stream=True)
+        response.close()
+    return response
+
+def is_healthy_status(status_code):
+    return status_code is not None and 200 <= status_code < 400
 
 def check_url_accessibility(url):
+    with health_cache_lock:
+        entry = health_cache.get(url)
+    if entry and is_health_entry_fresh(entry):
+        logging.debug(f"Доступность URL '{url}' взята из кэша (статус {entry['status_code']}).")
+        return entry['accessible']
+
+    # Устаревшую запись перепроверяем условным запросом
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    start = time.perf_counter()
     try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            logging.info(f"URL '{url}' доступен (статус {response.status_code}).")
-            return True
+        response = probe_url(url, headers=headers)
+        latency = time.perf_counter() - start
+        if response.status_code == 304 and entry:
+            logging.info(f"URL '{url}' не изменился (статус 304), запись кэша продлена.")
+            new_entry = dict(entry, latency=latency, checked_at=time.time())
         else:
-            logging.warning(f"URL '{url}' вернул статус {response.status_code}.")
-            return False
+            if is_healthy_status(response.status_code):
+                logging.info(f"URL '{url}' доступен (статус {response.status_code}).")
+            else:
+                logging.warning(f"URL '{url}' вернул статус {response.status_code}.")
+            new_entry = {
+                "status_code": response.status_code,
+                "accessible": is_healthy_status(response.status_code),
+                "latency": latency,
+                "checked_at": time.time(),
+                "etag": response.headers.get('ETag'),
+                "last_modified": response.headers.get('Last-Modified')
+            }
     except requests.RequestException:
         logging.error(f"Ошибка при проверке доступности URL '{url}'.")
-        return False
+        new_entry = {
+            "status_code": None,
+            "accessible": False,
+            "latency": time.perf_counter() - start,
+            "checked_at": time.time(),
+            "etag": None,
+            "last_modified": None
+        }
+
+    with health_cache_lock:
+        health_cache[url] = new_entry
+    return new_entry['accessible']
+
+def check_urls_accessibility(urls, max_workers=None, per_host_limit=None, show_progress=True):
+    """
+    Параллельно проверяет доступность набора URL.
+
+    Общее число одновременных запросов ограничено max_workers, а число запросов
+    к одному хосту - per_host_limit. Возвращает словарь {url: True/False}.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    if max_workers is None:
+        max_workers = settings.get("check_max_workers", default_settings["check_max_workers"])
+    if per_host_limit is None:
+        per_host_limit = settings.get("check_per_host_limit", default_settings["check_per_host_limit"])
+    max_workers = max(1, min(int(max_workers), len(urls)))
+    per_host_limit = max(1, int(per_host_limit))
+
+    host_semaphores = {}
+    for url in urls:
+        host = urlparse(url).netloc.lower()
+        if host not in host_semaphores:
+            host_semaphores[host] = threading.BoundedSemaphore(per_host_limit)
+
+    def check_with_host_limit(url):
+        with host_semaphores[urlparse(url).netloc.lower()]:
+            return check_url_accessibility(url)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(check_with_host_limit, url): url for url in urls}
+        for done, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                logging.error(f"Ошибка при проверке доступности URL '{url}': {e}")
+                results[url] = False
+            if show_progress:
+                print(f"\rПроверено URL: {done}/{len(urls)}", end="", flush=True)
+    if show_progress:
+        print()
+    save_health_cache()
+    logging.info(f"Массовая проверка доступности: проверено {len(results)} URL.")
+    return {url: results[url] for url in urls}
+
+def print_accessibility_report(results, elapsed):
+    accessible = [url for url, ok in results.items() if ok]
+    inaccessible = [url for url, ok in results.items() if not ok]
+    print(Fore.CYAN + "\nОтчет о проверке доступности:")
+    print(f"- Проверено URL: {len(results)}")
+    print(Fore.GREEN + f"- Доступно: {len(accessible)}")
+    print(Fore.RED + f"- Недоступно: {len(inaccessible)}")
+    print(f"- Время проверки: {elapsed:.2f} сек.")
+    if inaccessible:
+        print(Fore.YELLOW + "Недоступные URL:")
+        for url in inaccessible:
+            print(f"- {url}")
+    logging.info(f"Отчет о проверке доступности: доступно {len(accessible)}, недоступно {len(inaccessible)}, время {elapsed:.2f} сек.")
+
+def check_all_links(links):
+    if not links:
+        print(Fore.RED + "Нет сохраненных ссылок.")
+        return
+    start = time.perf_counter()
+    results = check_urls_accessibility(data['url'] for data in links.values())
+    print_accessibility_report(results, time.perf_counter() - start)
 
 def show_available_keys(links):
     if links:
         print(Fore.CYAN + "Доступные ключи для открытия браузера:")
-        for index, data in enumerate(links.values(), 1):
-            print(f"{index}. {Fore.YELLOW}{list(links.keys())[index - 1]} - {data['url']} (Категория: {data['category']}, Добавлено: {data['date_added']}, Описание: {data['description']})")
+        for index, (key, data) in enumerate(links.items(), 1):
+            print(f"{index}. {Fore.YELLOW}{key} - {data['url']} (Категория: {data['category']}, Добавлено: {data['date_added']}, Описание: {data['description']})")
     else:
         print(Fore.RED + "Нет доступных ключей.")
 
 def reset_program():
-    if os.path.exists(LINKS_FILENAME):
-        os.remove(LINKS_FILENAME)
+    if remove_links_files():
         logging.warning("Файл со ссылками удален.")
-    if os.path.exists(SETTINGS_FILENAME):
-        os.remove(SETTINGS_FILENAME)
+    if remove_json_file(SETTINGS_FILENAME):
         logging.warning("Файл с настройками удален.")
     print("Link Manager сброшен к настройкам по умолчанию.")
     logging.info("Программа сброшена к настройкам по умолчанию.")
@@ -432,7 +2950,13 @@ def hash_password(password):
     logging.info("Пароль захэширован.")
     return hashed
 
+@lru_cache(maxsize=1)
+def default_password_hash():
+    return bcrypt.hashpw(DEFAULT_PASSWORD.encode(), bcrypt.gensalt()).decode()
+
 def verify_password(stored_password, provided_password):
+    if not stored_password:
+        stored_password = default_password_hash()
     verified = bcrypt.checkpw(provided_password.encode(), stored_password.encode())
     if verified:
         logging.info("Пароль верифицирован.")
@@ -467,27 +2991,86 @@ def choose_file(save=False, filetypes=(("JSON files", "*.json"), ("All files", "
             logging.info(f"Выбран файл для импорта: {filepath}")
     return filepath
 
+RELEASES_URL = "https://api.github.com/repos/Razzery-gt/Link-Manager/releases/latest"
+
+def load_update_check():
+    try:
+        with open(UPDATE_CHECK_FILENAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+def save_update_check(result):
+    try:
+        atomic_write_json(UPDATE_CHECK_FILENAME, result)
+    except IOError as e:
+        logging.error(f"Ошибка при сохранении результата проверки обновлений: {e}")
+
+def fetch_latest_release():
+    timeout = settings.get("http_timeout", default_settings["http_timeout"])
+    response = requests.get(RELEASES_URL, timeout=timeout)
+    if response.status_code != 200:
+        raise IOError(f"статус {response.status_code}")
+    latest_release = response.json()
+    result = {
+        'checked_at': time.time(),
+        'latest_version': latest_release['tag_name'],
+        'release_notes': latest_release.get('body', 'Нет описания обновления.')
+    }
+    save_update_check(result)
+    return result
+
+def update_messages(current_version, result):
+    latest_version = result['latest_version']
+    release_notes = result['release_notes']
+    if current_version < latest_version:
+        logging.info(f"Доступна новая версия: {latest_version}. Текущая версия: {current_version}. Описание: {release_notes}")
+        return [Fore.YELLOW + f"Доступна новая версия: {latest_version}. Обновите программу.",
+                Fore.YELLOW + f"Описание обновления: {release_notes}"]
+    logging.info("Вы используете последнюю версию.")
+    return [Fore.GREEN + "Вы используете последнюю версию."]
+
 def check_for_updates(current_version):
+    """Проверяет обновления сразу, не используя сохраненный результат."""
     try:
-        response = requests.get("https://api.github.com/repos/Razzery-gt/Link-Manager/releases/latest")
-        if response.status_code == 200:
-            latest_release = response.json()
-            latest_version = latest_release['tag_name']
-            release_notes = latest_release.get('body', 'Нет описания обновления.')
-            if current_version < latest_version:
-                print(Fore.YELLOW + f"Доступна новая версия: {latest_version}. Обновите программу.")
-                print(Fore.YELLOW + f"Описание обновления: {release_notes}")
-                logging.info(f"Доступна новая версия: {latest_version}. Текущая версия: {current_version}. Описание: {release_notes}")
-            else:
-                print(Fore.GREEN + "Вы используете последнюю версию.")
-                logging.info("Вы используете последнюю версию.")
-        else:
-            print(Fore.RED + "Не удалось проверить обновления.")
-            logging.error(f"Ошибка при проверке обновлений: статус {response.status_code}")
+        for message in update_messages(current_version, fetch_latest_release()):
+            print(message)
     except Exception as e:
         print(Fore.RED + f"Ошибка при проверке обновлений: {e}")
         logging.error(f"Ошибка при проверке обновлений: {e}")
 
+def background_update_check(current_version):
+    try:
+        update_notices.extend(update_messages(current_version, fetch_latest_release()))
+    except Exception as e:
+        # Без сети меню не засоряется сообщениями об ошибке
+        logging.error(f"Ошибка при проверке обновлений: {e}")
+
+def start_update_check(current_version):
+    """
+    Запускает проверку обновлений в фоне, не чаще чем раз в update_check_interval секунд.
+    Пока интервал не истек, используется результат последней проверки.
+    """
+    global update_check_thread
+    if settings.get("offline_mode", default_settings["offline_mode"]):
+        logging.info("Автономный режим: проверка обновлений пропущена.")
+        return
+    cached = load_update_check()
+    interval = settings.get("update_check_interval", default_settings["update_check_interval"])
+    if cached and time.time() - cached.get('checked_at', 0) < interval:
+        try:
+            update_notices.extend(update_messages(current_version, cached))
+            return
+        except KeyError:
+            pass
+    update_check_thread = threading.Thread(target=background_update_check, args=(current_version,),
+                                           name="update-check", daemon=True)
+    update_check_thread.start()
+
+def print_update_notices():
+    while update_notices:
+        print(update_notices.popleft())
+
 def export_links(links, filename, format):
     try:
         if format == 'csv':
@@ -512,45 +3095,115 @@ def export_links(links, filename, format):
         print(Fore.GREEN + f"Ссылки экспортированы в {filename} в формате {format.upper()}.")
         logging.info(f"Ссылки экспортированы в {filename} в формате {format.upper()}.")
         statistics["last_export"] = str(datetime.now())
+        schedule_statistics_save()
+        run_plugins(links, 'export', filename=filename, format=format)
 
     except Exception as e:
         print(Fore.RED + f"Ошибка при экспорте ссылок: {e}.")
         logging.error(f"Ошибка при экспорте ссылок: {e}")
 
+class ProgressReporter:
+    """
+    Выводит ход длительной операции в одну строку не чаще одного раза в interval секунд.
+    Если известно общее количество (total), показывает полосу и процент выполнения.
+    """
+
+    BAR_WIDTH = 30
+
+    def __init__(self, label, interval=0.5, total=None):
+        self.label = label
+        self.interval = interval
+        self.total = total
+        self.count = 0
+        self.started = time.perf_counter()
+        self._last_shown = self.started
+        self._shown = False
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def update(self, count):
+        self.count = count
+        now = time.perf_counter()
+        if now - self._last_shown >= self.interval:
+            self._last_shown = now
+            self._shown = True
+            print(f"\r{self.line()}", end='', flush=True)
+
+    def line(self):
+        if self.total:
+            done = min(self.count / self.total, 1.0)
+            filled = int(done * self.BAR_WIDTH)
+            bar = "#" * filled + "." * (self.BAR_WIDTH - filled)
+            return f"{self.label}: [{bar}] {done:4.0%} {self.count}/{self.total} ({self.rate():.0f} строк/с)"
+        return f"{self.label}: {self.count} ({self.rate():.0f} строк/с)"
+
+    def finish(self):
+        if self._shown:
+            print(f"\r{self.line()}")
+        logging.info(f"{self.label}: {self.count} за {time.perf_counter() - self.started:.2f} с ({self.rate():.0f} строк/с)")
+
+def iter_batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 def export_to_csv(links, filename):
+    progress = ProgressReporter("Экспорт в CSV")
+    batch_size = settings.get("import_batch_size", default_settings["import_batch_size"])
     with open(filename, mode='w', newline='', encoding='utf-8') as csv_file:
         writer = csv.writer(csv_file)
         writer.writerow(['Key', 'URL', 'Date Added', 'Category', 'Description'])
-        for key, data in links.items():
-            writer.writerow([key, data['url'], data['date_added'], data['category'], data['description']])
+        for batch in iter_batches(links.items(), batch_size):
+            writer.writerows([key, data['url'], data['date_added'], data['category'], data['description']] for key, data in batch)
+            progress.update(progress.count + len(batch))
+    progress.finish()
     logging.info(f"Ссылки экспортированы в CSV: {filename}")
 
 def export_to_json(links, filename):
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(links, f, ensure_ascii=False, indent=4)
+        json.dump(plain_links(links), f, ensure_ascii=False, indent=4)
     logging.info(f"Ссылки экспортированы в JSON: {filename}")
 
 def export_to_yaml(links, filename):
     with open(filename, 'w', encoding='utf-8') as f:
-        yaml.dump(links, f, allow_unicode=True, indent=4, stream=f)
+        yaml.dump(plain_links(links), f, allow_unicode=True, indent=4)
     logging.info(f"Ссылки экспортированы в YAML: {filename}")
 
+def xml_escape(text):
+    # xml.sax.saxutils.escape делает то же, но его импорт тянет за собой urllib.request, http.client и ssl
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def xml_text_element(tag, text):
+    # Тот же вывод, что у ElementTree: пустой элемент - <tag />, в тексте экранируются &, < и >
+    return f"<{tag}>{xml_escape(text)}</{tag}>" if text else f"<{tag} />"
+
 def export_to_xml(links, filename):
-    root = ET.Element("links")
-    for key, data in links.items():
-        link = ET.SubElement(root, "link")
-        ET.SubElement(link, "key").text = key
-        ET.SubElement(link, "url").text = data['url']
-        ET.SubElement(link, "date_added").text = data['date_added']
-        ET.SubElement(link, "category").text = data['category']
-        ET.SubElement(link, "description").text = data['description']
-
-    tree = ET.ElementTree(root)
-    tree.write(filename, encoding='utf-8', xml_declaration=True)
+    # Элементы <link> пишутся по одному, дерево всего документа не строится
+    progress = ProgressReporter("Экспорт в XML")
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n<links>")
+        for count, (key, data) in enumerate(links.items(), 1):
+            f.write("<link>"
+                    + xml_text_element("key", key)
+                    + xml_text_element("url", data['url'])
+                    + xml_text_element("date_added", data['date_added'])
+                    + xml_text_element("category", data['category'])
+                    + xml_text_element("description", data['description'])
+                    + "</link>")
+            progress.update(count)
+        f.write("</links>")
+    progress.finish()
     logging.info(f"Ссылки экспортированы в XML: {filename}")
 
 def export_to_docx(links, filename):
-    document = Document()
+    document = docx.Document()
     document.add_heading('Links', level=1)
     for key, data in links.items():
         document.add_paragraph(f"Key: {key}")
@@ -573,17 +3226,33 @@ def export_to_txt(links, filename):
             f.write(f"Description: {data['description']}\n\n")
     logging.info(f"Ссылки экспортированы в TXT: {filename}")
 
-def export_to_xlsx(links, filename):
-    data = []
-    for key, link_data in links.items():
-        data.append([key, link_data['url'], link_data['date_added'], link_data['category'], link_data['description']])
+XLSX_COLUMNS = ['Key', 'URL', 'Date Added', 'Category', 'Description']
 
-    df = pd.DataFrame(data, columns=['Key', 'URL', 'Date Added', 'Category', 'Description'])
-    df.to_excel(filename, index=False)
+def export_to_xlsx(links, filename):
+    values = list(links.values())
+    df = pd.DataFrame({
+        'Key': list(links.keys()),
+        'URL': [data['url'] for data in values],
+        'Date Added': [data['date_added'] for data in values],
+        'Category': [data['category'] for data in values],
+        'Description': [data['description'] for data in values],
+    }, columns=XLSX_COLUMNS)
+    engine = settings.get("xlsx_write_engine")
+    try:
+        df.to_excel(filename, index=False, engine=engine)
+    except (ImportError, ValueError) as e:
+        if not engine:
+            raise
+        print(Fore.YELLOW + f"Движок '{engine}' недоступен ({e}). Используется движок по умолчанию.")
+        logging.warning(f"Движок записи XLSX '{engine}' недоступен: {e}")
+        df.to_excel(filename, index=False)
     logging.info(f"Ссылки экспортированы в XLSX: {filename}")
 
 def import_links(filename, format):
+    imported_count = 0
     try:
+        skipped_duplicates = 0
+        progress = ProgressReporter("Обработано записей")
         if format == 'csv':
             new_links = import_from_csv(filename)
         elif format == 'json':
@@ -593,67 +3262,91 @@ def import_links(filename, format):
         elif format == 'xml':
             new_links = import_from_xml(filename)
         elif format == 'docx':
-            new_links = import_from_docx(filename)
+            new_links = import_from_docx(filename, progress)
         elif format == 'txt':
-            new_links = import_from_txt(filename)
+            new_links = import_from_txt(filename, progress)
         elif format == 'xlsx':
-            new_links = import_from_xlsx(filename)
+            new_links, skipped_duplicates = import_from_xlsx(filename, url_links)
         else:
             print(Fore.RED + "Неподдерживаемый формат файла.")
             logging.warning(f"Попытка импорта из неподдерживаемого формата: {format}")
             return
 
-        imported_count = 0
-        skipped_duplicates = 0
-        for key, data in new_links.items():
-            if key in url_links:
-                print(Fore.YELLOW + f"Ключ '{key}' уже существует. Пропускаем.")
-                logging.warning(f"Пропущен дубликат ключа при импорте: '{key}'")
-                skipped_duplicates += 1
-            elif data['url'] in [link['url'] for link in url_links.values()]:
-                print(Fore.YELLOW + f"Ссылка '{data['url']}' уже существует. Пропускаем.")
-                logging.warning(f"Пропущена дублирующаяся ссылка при импорте: '{data['url']}'")
-                skipped_duplicates += 1
-            else:
-                url_links[key] = data
-                print(Fore.GREEN + f"Импортирована ссылка: {key} - {data['url']}")
-                logging.info(f"Импортирована ссылка: {key} - {data['url']}")
-                imported_count += 1
+        if isinstance(new_links, dict):
+            new_links = new_links.items()
+        skipped_invalid = 0
+        imported_keys = []
+        batch_size = settings.get("import_batch_size", default_settings["import_batch_size"])
+        # Записи проверяются и добавляются пачками: в памяти держится только текущая пачка,
+        # а дубликаты из прошлых пачек находятся по индексам хранилища. Каждая пачка сохраняется
+        # отдельно, поэтому при ошибке уже сохраненные пачки остаются; журнал сжимается один раз в конце
+        with deferred_journal_compaction():
+            for batch in iter_batches(new_links, batch_size):
+                batch = [(key, import_record(data)) for key, data in batch]
+                accepted = {}
+                accepted_urls = set()
+                valid_urls = validate_urls([data.get('url') for _, data in batch])
+                for (key, data), url_valid in zip(batch, valid_urls):
+                    if not url_valid:
+                        logging.warning(f"Неверный URL '{data.get('url')}' у ключа '{key}'. Пропущено.")
+                        skipped_invalid += 1
+                        continue
+                    if key in url_links or key in accepted:
+                        logging.debug(f"Пропущен дубликат ключа при импорте: '{key}'")
+                        skipped_duplicates += 1
+                    elif link_url_exists(url_links, data['url']) or url_links.url_key(data['url']) in accepted_urls:
+                        logging.debug(f"Пропущена дублирующаяся ссылка при импорте: '{data['url']}'")
+                        skipped_duplicates += 1
+                    else:
+                        accepted[key] = data
+                        accepted_urls.add(url_links.url_key(data['url']))
+                        logging.debug(f"Импортирована ссылка: {key} - {data['url']}")
+
+                url_links.add_many(accepted.items())
+                imported_count += len(accepted)
+                imported_keys.extend(accepted)
+                progress.update(progress.count + len(batch))
+        progress.finish()
+        shutdown_validation_pool()
 
-        save_links(url_links)
         statistics["last_import"] = str(datetime.now())
+        schedule_statistics_save()
+        run_plugins(url_links, 'import', filename=filename, format=format, imported_keys=imported_keys)
+        if skipped_invalid:
+            print(Fore.RED + f"Пропущено ссылок с неверным URL: {skipped_invalid}.")
         print(Fore.GREEN + f"Импортировано {imported_count} ссылок из {filename} в формате {format.upper()}. Пропущено {skipped_duplicates} дубликатов.")
-        logging.info(f"Импортировано {imported_count} ссылок из {filename} в формате {format.upper()}. Пропущено {skipped_duplicates} дубликатов.")
+        logging.info(f"Импортировано {imported_count} ссылок из {filename} в формате {format.upper()}. Пропущено {skipped_duplicates} дубликатов. Скорость: {progress.rate():.0f} записей/с.")
 
     except Exception as e:
-        print(Fore.RED + f"Ошибка при импорте ссылок: {e}.")
-        logging.error(f"Ошибка при импорте ссылок: {e}")
+        shutdown_validation_pool()
+        print(Fore.RED + f"Ошибка при импорте ссылок: {e}. Добавлено ссылок до ошибки: {imported_count}.")
+        logging.error(f"Ошибка при импорте ссылок: {e}. Добавлено ссылок до ошибки: {imported_count}.")
+
+def import_record(data):
+    """Приводит импортированную запись к виду словаря ссылки: старый формат "ключ": "url", дата по умолчанию."""
+    if isinstance(data, str):
+        data = {"url": data, "category": "Без категории", "description": ""}
+    data['date_added'] = normalize_date_added(data.get('date_added')) or str(datetime.now())
+    data.setdefault('description', "")
+    return data
 
 def import_from_csv(filename):
-    links = {}
-    with open(filename, mode='r', encoding='utf-8') as csv_file:
+    """Читает CSV построчно и выдает пары (ключ, данные), не загружая файл целиком."""
+    with open(filename, mode='r', newline='', encoding='utf-8') as csv_file:
         reader = csv.reader(csv_file)
         next(reader, None)  
         for row in reader:
+            # URL проверяются пачками в import_links
             if len(row) == 5:
                 key, url, date_added, category, description = row
-                if is_valid_url(url):
-                    links[key] = {'url': url, 'date_added': date_added, 'category': category, 'description': description}
-                else:
-                    print(Fore.RED + f"Неверный URL '{url}' в строке '{row}'. Пропускаем.")
-                    logging.warning(f"Неверный URL '{url}' в строке CSV '{row}'. Пропущено.")
+                yield key, {'url': url, 'date_added': date_added, 'category': category, 'description': description}
             elif len(row) == 4:
                 key, url, date_added, category = row
-                if is_valid_url(url):
-                    links[key] = {'url': url, 'date_added': date_added, 'category': category, 'description': ""}
-                else:
-                    print(Fore.RED + f"Неверный URL '{url}' в строке '{row}'. Пропускаем.")
-                    logging.warning(f"Неверный URL '{url}' в строке CSV '{row}'. Пропущено.")
+                yield key, {'url': url, 'date_added': date_added, 'category': category, 'description': ""}
             else:
                 print(Fore.RED + f"Неверное количество столбцов в строке CSV: '{row}'. Пропускаем.")
                 logging.warning(f"Неверное количество столбцов в строке CSV: '{row}'. Пропущено.")
     logging.info(f"Ссылки импортированы из CSV: {filename}")
-    return links
 
 def import_from_json(filename):
     with open(filename, 'r', encoding='utf-8') as f:
@@ -679,136 +3372,271 @@ def import_from_yaml(filename):
         return data or {}
 
 def import_from_xml(filename):
-    tree = ET.parse(filename)
-    root = tree.getroot()
-    links = {}
-    for link in root.findall('link'):
-        key = link.find('key').text
-        url = link.find('url').text
-        date_added = link.find('date_added').text
-        category = link.find('category').text
-        description = link.find('description').text if link.find('description') is not None else ""
-        links[key] = {'url': url, 'date_added': date_added, 'category': category, 'description': description}
+    """
+    Читает XML потоково и выдает пары (ключ, данные) для элементов <link> внутри корня.
+    Разобранные элементы сразу удаляются из дерева, поэтому память не растет с размером файла.
+    """
+    root = None
+    depth = 0
+    for event, element in ET.iterparse(filename, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1 and element.tag == 'link':
+            key = element.findtext('key')
+            url = element.findtext('url')
+            date_added = element.findtext('date_added')
+            category = element.findtext('category')
+            description = element.findtext('description') or ""
+            yield key, {'url': url, 'date_added': date_added, 'category': category, 'description': description}
+            root.clear()
     logging.info(f"Ссылки импортированы из XML: {filename}")
-    return links
 
-def import_from_docx(filename):
-    document = Document(filename)
-    links = {}
-    key = None
-    url = None
-    date_added = None
-    category = None
-    description = None
-
-    for paragraph in document.paragraphs:
-        text = paragraph.text
-        if text.startswith("Key: "):
-            key = text[5:]
-        elif text.startswith("URL: "):
-            url = text[5:]
-        elif text.startswith("Date Added: "):
-            date_added = text[12:]
-        elif text.startswith("Category: "):
-            category = text[10:]
-        elif text.startswith("Description: "):
-            description = text[13:]
-
-        if key and url and date_added and category:
-            links[key] = {'url': url, 'date_added': date_added, 'category': category, 'description': description or ""}
-            key = None
-            url = None
-            date_added = None
-            category = None
-            description = None
+# Префиксы строк в блоках записей TXT и DOCX (так их пишут export_to_txt и export_to_docx)
+LINK_RECORD_PREFIXES = (("Key: ", 'key'), ("URL: ", 'url'), ("Date Added: ", 'date_added'),
+                        ("Category: ", 'category'), ("Description: ", 'description'))
+
+def link_record(fields):
+    if fields.get('key') and fields.get('url') and fields.get('date_added') and fields.get('category'):
+        return fields['key'], {'url': fields['url'], 'date_added': fields['date_added'],
+                               'category': fields['category'], 'description': fields.get('description', "")}
+    logging.debug(f"Пропущена неполная запись: {fields}")
+    return None
+
+def parse_link_records(lines):
+    """
+    Разбирает блоки "Key: / URL: / Date Added: / Category: / Description:" за один проход
+    и выдает пары (ключ, данные). Запись завершается следующей строкой "Key: ",
+    пустой строкой или концом текста, поэтому описание после категории не теряется.
+    """
+    fields = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            record = link_record(fields) if fields else None
+            fields = {}
+            if record:
+                yield record
+            continue
+        for prefix, name in LINK_RECORD_PREFIXES:
+            if line.startswith(prefix):
+                if name == 'key' and fields:
+                    record = link_record(fields)
+                    fields = {}
+                    if record:
+                        yield record
+                fields[name] = line[len(prefix):]
+                break
+    if fields:
+        record = link_record(fields)
+        if record:
+            yield record
+
+def import_from_docx(filename, progress=None):
+    document = docx.Document(filename)
+    paragraphs = [paragraph.text for paragraph in document.paragraphs]
+    del document
+    if progress is not None:
+        progress.total = sum(1 for text in paragraphs if text.startswith("Key: "))
+    yield from parse_link_records(paragraphs)
     logging.info(f"Ссылки импортированы из DOCX: {filename}")
-    return links
-
-def import_from_txt(filename):
-    links = {}
-    key = None
-    url = None
-    date_added = None
-    category = None
-    description = None
 
+def count_txt_records(filename, chunk_size=1 << 20):
+    # Быстрый подсчет строк "Key: " по байтам, чтобы показать процент выполнения
+    count = 0
+    tail = b"\n"
+    with open(filename, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return count
+            data = tail + chunk
+            count += data.count(b"\nKey: ")
+            tail = data[-5:]
+
+def import_from_txt(filename, progress=None):
+    if progress is not None:
+        progress.total = count_txt_records(filename)
     with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("Key: "):
-                key = line[5:]
-            elif line.startswith("URL: "):
-                url = line[5:]
-            elif line.startswith("Date Added: "):
-                date_added = line[12:]
-            elif line.startswith("Category: "):
-                category = line[10:]
-            elif line.startswith("Description: "):
-                description = line[13:]
-
-            if key and url and date_added and category:
-                links[key] = {'url': url, 'date_added': date_added, 'category': category, 'description': description or ""}
-                key = None
-                url = None
-                date_added = None
-                category = None
-                description = None
+        yield from parse_link_records(f)
     logging.info(f"Ссылки импортированы из TXT: {filename}")
-    return links
 
-def import_from_xlsx(filename):
-    df = pd.read_excel(filename)
-    links = {}
-    for index, row in df.iterrows():
-        key = str(row['Key'])  
-        url = row['URL']
-        date_added = str(row['Date Added'])  
-        category = str(row['Category'])
-        description = str(row.get('Description', '')) 
-        links[key] = {'url': url, 'date_added': date_added, 'category': category, 'description': description}
+def import_from_xlsx(filename, existing=None):
+    """
+    Читает XLSX целиком в pandas и проверяет его по столбцам, без обхода строк в Python.
+    Ссылки, ключи или URL которых уже есть в existing, отбрасываются сразу.
+    Возвращает пары (ключ, данные) и количество отброшенных дубликатов.
+    """
+    engine = settings.get("xlsx_read_engine")
+    try:
+        df = pd.read_excel(filename, dtype=str, engine=engine)
+    except (ImportError, ValueError) as e:
+        if not engine:
+            raise
+        print(Fore.YELLOW + f"Движок '{engine}' недоступен ({e}). Используется движок по умолчанию.")
+        logging.warning(f"Движок чтения XLSX '{engine}' недоступен: {e}")
+        df = pd.read_excel(filename, dtype=str)
+    total = len(df)
+    df = df.reindex(columns=XLSX_COLUMNS).fillna('')
+    df['Key'] = df['Key'].str.strip()
+    df['URL'] = df['URL'].str.strip()
+
+    # Пустой URL, как и в остальных форматах, не принимается даже без проверки URL
+    valid = (df['Key'] != '') & (df['URL'] != '')
+    if settings["use_validators"] or settings["use_regex"]:
+        valid &= df['URL'].str.match(URL_PREFILTER_PATTERN)
+    if settings["use_regex"]:
+        valid &= df['URL'].str.match(URL_PATTERN)
+    if settings["use_validators"] and valid.any():
+        valid[valid] = validate_urls(df.loc[valid, 'URL'].tolist())
+    invalid_count = int((~valid).sum())
+    if invalid_count:
+        for url in df.loc[~valid, 'URL'].head(10):
+            logging.warning(f"Неверный URL '{url}' в файле XLSX. Пропущено.")
+        print(Fore.RED + f"Пропущено строк с неверным URL или пустым ключом: {invalid_count}.")
+    df = df[valid]
+
+    # Как и при чтении в словарь, из повторяющихся ключей остается последняя строка
+    df = df.drop_duplicates('Key', keep='last')
+    url_key = existing.url_key if existing is not None else (lambda url: url)
+    df = df.assign(url_key=df['URL'].map(url_key))
+    unique = ~df.duplicated('url_key', keep='first')
+    if existing is not None:
+        unique &= ~df['Key'].isin(existing.keys()) & ~df['url_key'].isin(existing.url_keys())
+    skipped_duplicates = (total - invalid_count) - int(unique.sum())
+    df = df[unique]
+
+    records = [
+        (key, {'url': url, 'date_added': date_added, 'category': category, 'description': description})
+        for key, url, date_added, category, description in zip(df['Key'], df['URL'], df['Date Added'], df['Category'], df['Description'])
+    ]
     logging.info(f"Ссылки импортированы из XLSX: {filename}")
-    return links
-
-def search_links(links, query, search_type='keyword', filters=None):
+    return records, skipped_duplicates
+
+def parse_date_filters(filters):
+    """Возвращает границы фильтра по дате (datetime или None); неверную дату сообщает один раз."""
+    bounds = []
+    for filter_name in ('date_from', 'date_to'):
+        value = filters.get(filter_name) if filters else None
+        bound = None
+        if value:
+            try:
+                bound = datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                print(Fore.RED + f"Неверный формат даты в фильтре: '{value}'. Фильтр не применен.")
+        bounds.append(bound)
+    return tuple(bounds)
+
+def search_links_in_memory(links, query, search_type='keyword', filters=None):
     found_links = {}
+    if search_type == 'regex':
+        matched_keys = regex_search_keys(links, compile_search_pattern(query))
+    elif isinstance(links, LinkStore):
+        matched_keys = links.search_keys(query)
+    else:
+        matched_keys = keyword_search_keys({key: keyword_search_text(key, data) for key, data in links.items()}, query)
+    candidates = ((key, links[key]) for key in matched_keys)
 
-    for key, data in links.items():
-        include = False
+    date_from, date_to = parse_date_filters(filters)
+    dated_keys = None
+    if (date_from or date_to) and isinstance(links, LinkStore):
+        dated_keys, undated = links.keys_in_date_range(date_from, date_to)
+        if undated:
+            print(Fore.YELLOW + f"У {undated} ссылок нераспознанная дата добавления, они не учитываются в фильтре по дате.")
 
-        if search_type == 'regex':
-            if re.search(query, key, re.IGNORECASE) or re.search(query, data['url'], re.IGNORECASE) or re.search(query, data['category'], re.IGNORECASE) or re.search(query, data['description'], re.IGNORECASE):
-                include = True
-        else:
-            if query.lower() in key.lower() or query.lower() in data['url'].lower() or query.lower() in data['category'].lower() or query.lower() in data['description'].lower():
-                include = True
+    for key, data in candidates:
+        include = True
 
         if filters:
-            if filters.get('category') and data['category'].lower() != filters['category'].lower():
+            if filters.get('category') and (data.get('category') or '').lower() != filters['category'].lower():
                 include = False
-            if filters.get('date_from'):
-                try:
-                    link_date = datetime.strptime(data['date_added'], '%Y-%m-%d %H:%M:%S.%f')
-                    filter_date = datetime.strptime(filters['date_from'], '%Y-%m-%d')
-                    if link_date < filter_date:
-                        include = False
-                except ValueError:
-                    print(Fore.RED + "Неверный формат даты в фильтре.")
-            if filters.get('date_to'):
-                try:
-                    link_date = datetime.strptime(data['date_added'], '%Y-%m-%d %H:%M:%S.%f')
-                    filter_date = datetime.strptime(filters['date_to'], '%Y-%m-%d')
-                    if link_date > filter_date:
-                        include = False
-                except ValueError:
-                    print(Fore.RED + "Неверный формат даты в фильтре.")
-            if filters.get('status'):
-                accessible = check_url_accessibility(data['url'])
-                if (filters['status'] == 'accessible' and not accessible) or (filters['status'] == 'inaccessible' and accessible):
+            if dated_keys is not None and key not in dated_keys:
+                include = False
+            elif dated_keys is None and (date_from or date_to):
+                link_date = parse_date_added(data['date_added'])
+                if link_date is None or (date_from and link_date < date_from) or (date_to and link_date > date_to):
                     include = False
 
         if include:
             found_links[key] = data
 
+    return found_links
+
+def search_links_sql(links, query, search_type='keyword', filters=None):
+    conditions = []
+    params = []
+    regex_keys = None
+    if search_type == 'regex':
+        # Те же ссылки есть в памяти: поиск по ним ограничен regex_timeout, а функция REGEXP
+        # внутри запроса SQLite прервать нельзя
+        regex_keys = set(regex_search_keys(links, compile_search_pattern(query)))
+    else:
+        # Каждое слово запроса должно встретиться в одном из полей, как в keyword_search_keys
+        for term in query.lower().split():
+            if db_fts_enabled and len(term) >= SEARCH_MIN_TERM_LENGTH:
+                conditions.append("(rowid IN (SELECT rowid FROM links_fts WHERE links_fts MATCH ?) OR instr(category_lower, ?) > 0)")
+                params.extend(['"' + term.replace('"', '""') + '"', term])
+            else:
+                conditions.append("(instr(py_lower(key), ?) > 0 OR instr(py_lower(url), ?) > 0 OR instr(category_lower, ?) > 0 OR instr(py_lower(description), ?) > 0)")
+                params.extend([term] * 4)
+
+    if filters:
+        if filters.get('category'):
+            conditions.append("category_lower = ?")
+            params.append(filters['category'].lower())
+        date_from, date_to = parse_date_filters(filters)
+        if date_from:
+            conditions.append("date_added >= ?")
+            params.append(str(date_from))
+        if date_to:
+            conditions.append("date_added <= ?")
+            params.append(str(date_to))
+
+    sql = "SELECT key FROM links"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY rowid"
+    with db_lock:
+        keys = [row[0] for row in get_db_connection().execute(sql, params)]
+    if regex_keys is not None:
+        keys = [key for key in keys if key in regex_keys]
+    elif any(len(term) >= SEARCH_MIN_TERM_LENGTH for term in query.lower().split()):
+        # Тот же порядок по релевантности, что и при поиске в памяти (см. keyword_search_keys)
+        keys = keyword_search_keys({key: keyword_search_text(key, links[key]) for key in keys if key in links}, query)
+    return {key: links[key] for key in keys if key in links}
+
+def search_links(links, query, search_type='keyword', filters=None):
+    if search_type == 'regex' and get_search_pattern(query) is None:
+        return
+    try:
+        if is_sqlite_backend() and links is url_links:
+            found_links = search_links_sql(links, query, search_type, filters)
+        else:
+            found_links = search_links_in_memory(links, query, search_type, filters)
+    except sqlite3.Error as e:
+        print(Fore.RED + f"Ошибка поиска: {e}.")
+        logging.error(f"Ошибка поиска в базе данных: {e}")
+        return
+    except TimeoutError as e:
+        print(Fore.RED + f"Поиск прерван: превышено время ожидания ({e}). Упростите регулярное выражение.")
+        logging.warning(f"Поиск по регулярному выражению '{query}' прерван по времени: {e}")
+        return
+    except (OSError, RuntimeError) as e:
+        print(Fore.RED + f"Ошибка поиска: {e}.")
+        logging.error(f"Ошибка поиска по регулярному выражению '{query}': {e}")
+        return
+
+    # Доступность проверяется одним параллельным проходом только для ссылок, прошедших остальные фильтры
+    if filters and filters.get('status') and found_links:
+        start = time.perf_counter()
+        accessibility = check_urls_accessibility(data['url'] for data in found_links.values())
+        print_accessibility_report(accessibility, time.perf_counter() - start)
+        wanted = filters['status'] == 'accessible'
+        found_links = {key: data for key, data in found_links.items() if accessibility.get(data['url'], False) == wanted}
+
     if found_links:
         print(Fore.CYAN + "Найденные ссылки:")
         for key, data in found_links.items():
@@ -819,10 +3647,14 @@ def search_links(links, query, search_type='keyword', filters=None):
         logging.info("Поиск не дал результатов.")
 
 def show_statistics(links):
-    category_counts = {}
-    for data in links.values():
-        category = data['category']
-        category_counts[category] = category_counts.get(category, 0) + 1
+    if is_sqlite_backend() and links is url_links:
+        with db_lock:
+            category_counts = dict(get_db_connection().execute("SELECT category, COUNT(*) FROM links GROUP BY category ORDER BY MIN(rowid)").fetchall())
+    else:
+        category_counts = {}
+        for data in links.values():
+            category = data['category']
+            category_counts[category] = category_counts.get(category, 0) + 1
 
     print(Fore.CYAN + "\nСтатистика:")
     print(Fore.YELLOW + "Количество ссылок по категориям:")
@@ -847,6 +3679,7 @@ def reset_statistics():
         "last_modified": None,
         "last_deleted": None
     }
+    schedule_statistics_save()
     print(Fore.GREEN + "Статистика сброшена.")
     logging.info("Статистика сброшена.")
 
@@ -864,6 +3697,97 @@ def set_log_level(settings):
         settings["log_level"] = "INFO"
         save_settings(settings)
 
+def iter_benchmark_links(count):
+    categories = ["Поиск", "Новости", "Работа", "Учеба", "Видео", "Музыка", "Без категории", "Общее"]
+    words = ["python", "новости", "погода", "рецепт", "курс", "документация", "фильм", "музыка", "карта", "магазин"]
+    for i in range(count):
+        yield f"link_{i}", {
+            "url": f"https://site{i % 5000}.example.com/page/{i}",
+            "date_added": str(datetime(2020 + i % 5, 1 + i % 12, 1 + i % 28, i % 24, i % 60, i % 60, i % 1000000)),
+            "category": categories[i % len(categories)],
+            "description": f"{words[i % len(words)]} {words[(i * 7) % len(words)]} страница {i}"
+        }
+
+def generate_benchmark_links(count):
+    return dict(iter_benchmark_links(count))
+
+def run_search_benchmark(sizes=(10_000, 100_000, 1_000_000), repeats=5):
+    queries = ["python", "site42.example", "новости курс", "page/12345", "нет-такой-строки"]
+    print(Fore.CYAN + "\nЗамер скорости поиска по ключевому слову (мс на запрос):")
+    print(f"{'Ссылок':>10} {'Индекс':>10} {'Перебор':>10} {'Построение индекса, с':>24}")
+    for size in sizes:
+        links = generate_benchmark_links(size)
+        store = LinkStore(links)
+        start = time.perf_counter()
+        store.build_search_index()
+        build_time = time.perf_counter() - start
+
+        index_time = scan_time = 0.0
+        for query in queries:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                search_links_in_memory(store, query)
+            index_time += time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(repeats):
+                search_links_in_memory(links, query)
+            scan_time += time.perf_counter() - start
+        runs = repeats * len(queries)
+        print(f"{size:>10} {index_time / runs * 1000:>10.2f} {scan_time / runs * 1000:>10.2f} {build_time:>24.2f}")
+        logging.info(f"Замер поиска: {size} ссылок, индекс {index_time / runs * 1000:.2f} мс, перебор {scan_time / runs * 1000:.2f} мс, построение {build_time:.2f} с.")
+        del links, store
+
+def measure_links_memory(count, make_record):
+    # Записи проходят через JSON, как при загрузке url_links.json: у каждой ссылки свои строки категории и даты
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        links = {key: make_record(json.loads(json.dumps(data, ensure_ascii=False))) for key, data in iter_benchmark_links(count)}
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del links
+    return current, peak, elapsed
+
+def run_memory_benchmark(sizes=(100_000, 1_000_000)):
+    print(Fore.CYAN + "\nЗамер памяти: словари ссылок и записи Link (tracemalloc):")
+    print(f"{'Ссылок':>10} {'Словари, МБ':>12} {'Link, МБ':>10} {'Байт на ссылку':>22} {'Пик Link, МБ':>14}")
+    for size in sizes:
+        dict_memory, _, dict_time = measure_links_memory(size, dict)
+        link_memory, link_peak, link_time = measure_links_memory(size, Link)
+        per_link = f"{dict_memory / size:.0f} -> {link_memory / size:.0f}" if size else "-"
+        print(f"{size:>10} {dict_memory / 2**20:>12.1f} {link_memory / 2**20:>10.1f} {per_link:>22} {link_peak / 2**20:>14.1f}")
+        logging.info(f"Замер памяти: {size} ссылок, словари {dict_memory / 2**20:.1f} МБ ({dict_time:.1f} с), "
+                     f"Link {link_memory / 2**20:.1f} МБ ({link_time:.1f} с).")
+
+def configure_health_cache():
+    while True:
+        print("\nКэш проверки доступности:")
+        print(f"Записей в кэше: {len(health_cache)}")
+        print(f"1. Время жизни записи, сек. (сейчас: {settings['health_cache_ttl']})")
+        print(f"2. Время жизни записи о недоступной ссылке, сек. (сейчас: {settings['health_cache_negative_ttl']})")
+        print(f"3. Максимальное количество записей (сейчас: {settings['health_cache_max_entries']})")
+        print("4. Очистить кэш")
+        print("5. Назад")
+
+        choice = menu_option("Введите номер действия: ", range(1, 6))
+
+        if choice in (1, 2, 3):
+            setting_key = {1: "health_cache_ttl", 2: "health_cache_negative_ttl", 3: "health_cache_max_entries"}[choice]
+            value = input("Введите новое значение: ").strip()
+            if value.isdigit():
+                settings[setting_key] = int(value)
+                save_settings(settings)
+                print(Fore.GREEN + "Настройка кэша изменена.")
+                logging.info(f"Настройка '{setting_key}' изменена на {value}.")
+            else:
+                print(Fore.RED + "Неверный ввод.")
+        elif choice == 4:
+            clear_health_cache()
+        elif choice == 5:
+            break
+
 def run_debug_functions(links):
     print(Fore.CYAN + "\nОтладочные функции:")
     print("1. Вывести все настройки")
@@ -875,24 +3799,36 @@ def run_debug_functions(links):
     print("7. Включить/отключить проверку через регулярные выражения")
     print("8. Включить/отключить проверку через Validators")
     print("9. Проверка актуальной версии")
-    print("10. Назад")
+    print("10. Проверить доступность всех ссылок")
+    print("11. Замер скорости поиска")
+    print("12. Замер памяти на ссылку")
+    print("13. Назад")
 
-    choice = menu_option("Выберите действие: ", range(1, 11))
+    choice = menu_option("Выберите действие: ", range(1, 14))
 
     if choice == 1:
         print(Fore.YELLOW + "Текущие настройки:")
         print(json.dumps(settings, indent=4, ensure_ascii=False))
         logging.debug("Выведены текущие настройки.")
     elif choice == 2:
-        url_to_test = input("Введите URL для тестирования: ")
-        if is_valid_url(url_to_test):
-            if check_url_accessibility(url_to_test):
-                print(Fore.GREEN + f"URL '{url_to_test}' доступен.")
-                logging.debug(f"URL '{url_to_test}' признан доступным через отладочную функцию.")
-            else:
-                print(Fore.RED + f"URL '{url_to_test}' недоступен.")
-                logging.debug(f"URL '{url_to_test}' признан недоступным через отладочную функцию.")
-        else:
+        urls_to_test = input("Введите URL для тестирования (несколько URL - через пробел): ").split()
+        invalid_urls = [url for url in urls_to_test if not is_valid_url(url)]
+        for url in invalid_urls:
+            print(Fore.RED + f"Неверный URL: {url}")
+        valid_urls = [url for url in urls_to_test if url not in invalid_urls]
+        if valid_urls:
+            start = time.perf_counter()
+            results = check_urls_accessibility(valid_urls, show_progress=len(valid_urls) > 1)
+            for url_to_test, accessible in results.items():
+                if accessible:
+                    print(Fore.GREEN + f"URL '{url_to_test}' доступен.")
+                    logging.debug(f"URL '{url_to_test}' признан доступным через отладочную функцию.")
+                else:
+                    print(Fore.RED + f"URL '{url_to_test}' недоступен.")
+                    logging.debug(f"URL '{url_to_test}' признан недоступным через отладочную функцию.")
+            if len(results) > 1:
+                print_accessibility_report(results, time.perf_counter() - start)
+        elif not urls_to_test:
             print(Fore.RED + "Неверный URL.")
     elif choice == 3:
         try:
@@ -904,12 +3840,10 @@ def run_debug_functions(links):
             print(Fore.RED + f"Ошибка при очистке файла логов: {e}")
             logging.error(f"Ошибка при очистке файла логов через отладочную функцию: {e}")
     elif choice == 4:
-        if os.path.exists(SETTINGS_FILENAME):
-            os.remove(SETTINGS_FILENAME)
+        remove_json_file(SETTINGS_FILENAME)
         print(Fore.GREEN + "Файл настроек сброшен.")
     elif choice == 5:
-        if os.path.exists(LINKS_FILENAME):
-            os.remove(LINKS_FILENAME)
+        if remove_links_files():
             logging.warning("Файл со ссылками удален.")
             print(Fore.GREEN + "Файл ссылок сброшен.")
         else:
@@ -929,6 +3863,20 @@ def run_debug_functions(links):
     elif choice == 9:
         check_for_updates("3.1.1")
     elif choice == 10:
+        check_all_links(links)
+    elif choice == 11:
+        sizes_str = input("Введите количество ссылок через пробел (Enter - 10000 100000 1000000): ").split()
+        if all(size.isdigit() for size in sizes_str):
+            run_search_benchmark(tuple(int(size) for size in sizes_str) or (10_000, 100_000, 1_000_000))
+        else:
+            print(Fore.RED + "Неверный ввод.")
+    elif choice == 12:
+        sizes_str = input("Введите количество ссылок через пробел (Enter - 100000 1000000): ").split()
+        if all(size.isdigit() for size in sizes_str):
+            run_memory_benchmark(tuple(int(size) for size in sizes_str) or (100_000, 1_000_000))
+        else:
+            print(Fore.RED + "Неверный ввод.")
+    elif choice == 13:
         pass
 
 def menu_option(prompt, options):
@@ -942,268 +3890,375 @@ def menu_option(prompt, options):
         except ValueError:
             print(Fore.RED + "Неверный ввод. Пожалуйста, попробуйте снова.")
 
-os.makedirs(DOCUMENTS_DIR, exist_ok=True)
-url_links = load_links()
-settings = load_settings()
-statistics = load_statistics()
-set_log_level(settings) 
-
-if settings["password_required"]:
-    password_attempts = 3
-    while password_attempts > 0:
-        password_input = getpass.getpass("Введите пароль для доступа к Link Manager: ")
-        if verify_password(settings["password"], password_input):
-            break
+def print_startup_profile():
+    total = time.perf_counter() - STARTUP_STARTED
+    print(Fore.CYAN + "\nПрофиль запуска:")
+    for name, elapsed in startup_timings:
+        print(f"  {name:<40} {elapsed * 1000:9.1f} мс")
+    print(Fore.CYAN + f"  {'Всего до главного меню':<40} {total * 1000:9.1f} мс")
+    # Отложенные модули загружаются здесь только для того, чтобы показать сэкономленное время
+    print(Fore.CYAN + "\nМодули, загружаемые по требованию:")
+    for module in LAZY_MODULES:
+        name = module._name
+        loaded_at_startup = name in lazy_import_timings
+        try:
+            module._load()
+        except ImportError as e:
+            print(Fore.RED + f"  {name:<40} не установлен ({e})")
+            continue
+        note = " (загружен при запуске)" if loaded_at_startup else ""
+        print(f"  {name:<40} {lazy_import_timings[name] * 1000:9.1f} мс{note}")
+    logging.info(f"Профиль запуска: {', '.join(f'{name} {elapsed * 1000:.1f} мс' for name, elapsed in startup_timings)}")
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Link Manager")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="показать время импорта и инициализации по компонентам и выйти")
+    return parser.parse_args()
+
+def main():
+    global settings, url_links, statistics, plugins_config
+    startup_timings.append(("Импорт модулей и определения", time.perf_counter() - STARTUP_STARTED))
+    args = parse_arguments()
+
+    os.makedirs(DOCUMENTS_DIR, exist_ok=True)
+    with startup_step("Настройки"):
+        settings = load_settings()
+    with startup_step("Ссылки"):
+        url_links = load_links()
+        attach_store_listeners(url_links)
+    with startup_step("Статистика"):
+        statistics = load_statistics()
+    with startup_step("Кэш проверки доступности"):
+        health_cache.update(load_health_cache())
+    set_log_level(settings) 
+
+    if args.profile_startup:
+        with startup_step("Обнаружение плагинов"):
+            discover_plugins()
+        print_startup_profile()
+        wait_for_journal_compaction()
+        close_db_connection()
+        return
+
+    if settings["password_required"]:
+        password_attempts = 3
+        while password_attempts > 0:
+            password_input = getpass.getpass("Введите пароль для доступа к Link Manager: ")
+            if verify_password(settings["password"], password_input):
+                break
+            else:
+                password_attempts -= 1
+                print(Fore.RED + f"Неверный пароль. Осталось попыток: {password_attempts}")
+                logging.warning(f"Неудачная попытка ввода пароля. Осталось {password_attempts} попыток.")
         else:
-            password_attempts -= 1
-            print(Fore.RED + f"Неверный пароль. Осталось попыток: {password_attempts}")
-            logging.warning(f"Неудачная попытка ввода пароля. Осталось {password_attempts} попыток.")
-    else:
-        print(Fore.RED + "Доступ запрещен. Нажмите любую клавишу, чтобы продолжить...")
-        input()
-        logging.critical("Доступ к программе запрещен из-за неверного пароля.")
-        exit()
-
-print(Fore.GREEN + "Добро пожаловать в Link Manager!")
-print(Fore.GREEN + "Версия: 3.1.1")
-logging.info("Программа запущена.")
-
-check_for_updates("3.1.1")
-
-while True:
-    print("\nВыберите действие:")
-    print("1. Открыть ссылку по ключу")
-    print("2. Добавить новую ссылку или изменить существующую")
-    print("3. Удалить ссылку")
-    print("4. Переименовать ссылку")
-    print("5. Показать доступные ключи")
-    print("6. Настройки")
-    print("7. Подсчитать количество сохраненных ссылок")
-    print("8. Экспорт ссылок")
-    print("9. Импорт ссылок")
-    print("10. Поиск ссылок")
-    print("11. Статистика")
-    print("12. Выход")
-
-    choice = menu_option("Введите номер действия: ", range(1, 13))
+            print(Fore.RED + "Доступ запрещен. Нажмите любую клавишу, чтобы продолжить...")
+            input()
+            logging.critical("Доступ к программе запрещен из-за неверного пароля.")
+            exit()
 
-    if choice == 1:
-        if settings["show_links"]:
-            show_available_keys(url_links)
-        user_input = input("Введите ключ для открытия браузера (или введите номер, или 'copy'): ").strip()
+    print(Fore.GREEN + "Добро пожаловать в Link Manager!")
+    print(Fore.GREEN + "Версия: 3.1.1")
+    logging.info("Программа запущена.")
 
-        if user_input.lower() == 'copy':
-            key_to_copy = input("Введите ключ ссылки для копирования: ")
-            if key_to_copy in url_links:
-                copy_to_clipboard(url_links[key_to_copy]['url'])
-            else:
-                print(Fore.RED + f"Ключ '{key_to_copy}' не найден.")
-        elif user_input.isdigit():
-            selected_index = int(user_input) - 1
-            if 0 <= selected_index < len(url_links):
-                key_list = list(url_links.keys())
-                selected_key = key_list[selected_index]
+    start_update_check("3.1.1")
+
+    while True:
+        print_update_notices()
+        print("\nВыберите действие:")
+        print("1. Открыть ссылку по ключу")
+        print("2. Добавить новую ссылку или изменить существующую")
+        print("3. Удалить ссылку")
+        print("4. Переименовать ссылку")
+        print("5. Показать доступные ключи")
+        print("6. Настройки")
+        print("7. Подсчитать количество сохраненных ссылок")
+        print("8. Экспорт ссылок")
+        print("9. Импорт ссылок")
+        print("10. Поиск ссылок")
+        print("11. Статистика")
+        print("12. Выход")
+
+        choice = menu_option("Введите номер действия: ", range(1, 13))
+
+        if choice == 1:
+            if settings["show_links"]:
+                show_available_keys(url_links)
+            user_input = input("Введите ключ для открытия браузера (или введите номер, или 'copy'): ").strip()
+
+            if user_input.lower() == 'copy':
+                key_to_copy = input("Введите ключ ссылки для копирования: ")
+                if key_to_copy in url_links:
+                    copy_to_clipboard(url_links[key_to_copy]['url'])
+                else:
+                    print(Fore.RED + f"Ключ '{key_to_copy}' не найден.")
+            elif user_input.isdigit():
+                selected_key = url_links.key_at(int(user_input) - 1)
+                if selected_key is not None:
+                    selected_url = url_links[selected_key]['url']
+                    if check_url_accessibility(selected_url):
+                        open_browser(selected_url)
+                        run_plugins(url_links, 'open', selected_key)
+                    else:
+                        print(Fore.RED + f"Не удалось получить доступ к URL: {selected_url}")
+                else:
+                    print(Fore.RED + "Неверный номер ключа.")
+            elif url_links.find_key(user_input) is not None:
+                selected_key = url_links.find_key(user_input)
                 selected_url = url_links[selected_key]['url']
                 if check_url_accessibility(selected_url):
                     open_browser(selected_url)
+                    run_plugins(url_links, 'open', selected_key)
                 else:
                     print(Fore.RED + f"Не удалось получить доступ к URL: {selected_url}")
             else:
-                print(Fore.RED + "Неверный номер ключа.")
-        elif user_input.lower() in [k.lower() for k in url_links.keys()]:
-            selected_key = next(k for k in url_links.keys() if k.lower() == user_input.lower())
-            selected_url = url_links[selected_key]['url']
-            if check_url_accessibility(selected_url):
-                open_browser(selected_url)
+                print(Fore.RED + f"Ключ '{user_input}' не найден.")
+                suggestions = url_links.complete_key(user_input, limit=5) or url_links.suggest_keys(user_input)
+                if suggestions:
+                    print(Fore.YELLOW + "Возможно, вы имели в виду: " + ", ".join(suggestions))
+
+        elif choice == 2:
+            new_key = input("Введите ключ: ")
+            new_url = input("Введите URL: ")
+            new_category = input("Введите категорию: ")
+            new_description = input("Введите описание: ")
+
+            if not is_valid_url(new_url):
+                print(Fore.RED + "Неверный URL. Пожалуйста, введите корректный URL.")
+                continue
+
+            if link_url_exists(url_links, new_url):
+                print(Fore.RED + f"Эта ссылка уже существует (ключ '{url_links.find_key_by_url(new_url)}').")
+                continue
+            try:
+                url_links[new_key] = {"url": new_url, "date_added": str(datetime.now()), "category": new_category, "description": new_description}
+            except Exception as e:
+                print(Fore.RED + f"Ошибка при сохранении ссылки: {e}. Ссылка не добавлена.")
+                logging.error(f"Ошибка при сохранении ссылки '{new_key}': {e}")
+                continue
+            statistics["last_modified"] = str(datetime.now())  
+            schedule_statistics_save()
+            print(Fore.GREEN + f"Ссылка для ключа '{new_key}' добавлена/обновлена.")
+            logging.info(f"Добавлена/обновлена ссылка: '{new_key}' - '{new_url}' (Категория: '{new_category}', Описание: '{new_description}')")
+            run_plugins(url_links, 'add', new_key)
+
+        elif choice == 3:
+            key_to_delete = input("Введите ключ для удаления: ")
+            if key_to_delete in url_links:
+                try:
+                    del url_links[key_to_delete]
+                except Exception as e:
+                    print(Fore.RED + f"Ошибка при сохранении изменений: {e}. Ссылка не удалена.")
+                    logging.error(f"Ошибка при удалении ссылки '{key_to_delete}': {e}")
+                    continue
+                statistics["last_deleted"] = str(datetime.now())  
+                schedule_statistics_save()
+                print(Fore.GREEN + f"Ссылка для ключа '{key_to_delete}' удалена.")
+                logging.info(f"Удалена ссылка с ключом: '{key_to_delete}'.")
+                run_plugins(url_links, 'delete', key_to_delete)
             else:
-                print(Fore.RED + f"Не удалось получить доступ к URL: {selected_url}")
-        else:
-            print(Fore.RED + f"Ключ '{user_input}' не найден.")
-
-    elif choice == 2:
-        new_key = input("Введите ключ: ")
-        new_url = input("Введите URL: ")
-        new_category = input("Введите категорию: ")
-        new_description = input("Введите описание: ")
+                print(Fore.RED + f"Ключ '{key_to_delete}' не найден.")
 
-        if not is_valid_url(new_url):
-            print(Fore.RED + "Неверный URL. Пожалуйста, введите корректный URL.")
-            continue
+        elif choice == 4:
+            old_key = input("Введите текущий ключ: ")
+            new_key = input("Введите новый ключ: ")
+            if old_key in url_links:
+                try:
+                    url_links.rename(old_key, new_key)
+                except Exception as e:
+                    print(Fore.RED + f"Ошибка при сохранении изменений: {e}. Ключ не переименован.")
+                    logging.error(f"Ошибка при переименовании ключа '{old_key}': {e}")
+                    continue
+                print(Fore.GREEN + f"Ключ '{old_key}' переименован в '{new_key}'.")
+                logging.info(f"Ключ '{old_key}' переименован в '{new_key}'.")
+                run_plugins(url_links, 'rename', new_key, old_key=old_key)
+            else:
+                print(Fore.RED + f"Ключ '{old_key}' не найден.")
 
-        if new_url in [link['url'] for link in url_links.values()]:
-            print(Fore.RED + "Эта ссылка уже существует.")
-            continue
-        url_links[new_key] = {"url": new_url, "date_added": str(datetime.now()), "category": new_category, "description": new_description}
-        save_links(url_links)
-        statistics["last_modified"] = str(datetime.now())  
-        print(Fore.GREEN + f"Ссылка для ключа '{new_key}' добавлена/обновлена.")
-        logging.info(f"Добавлена/обновлена ссылка: '{new_key}' - '{new_url}' (Категория: '{new_category}', Описание: '{new_description}')")
+        elif choice == 5:
+            show_available_keys(url_links)
 
-    elif choice == 3:
-        key_to_delete = input("Введите ключ для удаления: ")
-        if key_to_delete in url_links:
-            del url_links[key_to_delete]
-            save_links(url_links)
-            statistics["last_deleted"] = str(datetime.now())  
-            print(Fore.GREEN + f"Ссылка для ключа '{key_to_delete}' удалена.")
-            logging.info(f"Удалена ссылка с ключом: '{key_to_delete}'.")
-        else:
-            print(Fore.RED + f"Ключ '{key_to_delete}' не найден.")
+        elif choice == 6:
+            while True:
+                print("\nНастройки:")
+                print("1. Изменить пароль для входа")
+                print("2. Пароль на открытие программы (сейчас: " + ("ВКЛ" if settings["password_required"] else "ВЫКЛ") + ")")
+                print("3. Отображать ссылки (сейчас: " + ("ВКЛ" if settings["show_links"] else "ВЫКЛ") + ")")
+                print("4. Уровень логирования (сейчас: " + settings.get("log_level", "INFO") + ")")
+                print("5. Проверка через регулярные выражения (сейчас: " + ("ВКЛ" if settings["use_regex"] else "ВЫКЛ") + ")")
+                print("6. Проверка через Validators (сейчас: " + ("ВКЛ" if settings["use_validators"] else "ВЫКЛ") + ")")
+                print("7. Отладочные функции")
+                print("8. Сброс программы")
+                print("9. Центр плагинов")
+                print("10. Кэш проверки доступности")
+                print("11. Хранилище ссылок (сейчас: " + settings.get("storage_backend", "json").upper() + ")")
+                print("12. Считать похожие URL дубликатами (сейчас: " + ("ВКЛ" if settings["normalize_urls"] else "ВЫКЛ") + ")")
+                print("13. Автономный режим (сейчас: " + ("ВКЛ" if settings["offline_mode"] else "ВЫКЛ") + ")")
+                print("14. Бинарный снимок ссылок для быстрой загрузки (сейчас: " + ("ВКЛ" if settings["binary_snapshot"] else "ВЫКЛ") + ")")
+                print("15. Защита от медленных регулярных выражений (сейчас: " + ("ВКЛ" if settings["regex_guard"] else "ВЫКЛ") + ")")
+                print("16. Назад")
+
+                settings_choice = menu_option("Введите номер действия: ", range(1, 17))
+
+                if settings_choice == 1:
+                    new_password = getpass.getpass("Введите новый пароль: ")
+                    settings["password"] = hash_password(new_password)
+                    save_settings(settings)
+                    print(Fore.GREEN + "Пароль изменен.")
+                elif settings_choice == 2:
+                    settings["password_required"] = not settings["password_required"]
+                    save_settings(settings)
+                    status = "включено" if settings["password_required"] else "выключено"
+                    print(f"Требование пароля {status}.")
+                elif settings_choice == 3:
+                    settings["show_links"] = not settings["show_links"]
+                    save_settings(settings)
+                    status = "включено" if settings["show_links"] else "выключено"
+                    print(f"Отображение ссылок {status}.")
+                elif settings_choice == 4:
+                    print("\nВыберите уровень логирования:")
+                    print("1. DEBUG")
+                    print("2. INFO")
+                    print("3. WARNING")
+                    print("4. ERROR")
+                    print("5. CRITICAL")
+                    log_level_choice = menu_option("Введите номер уровня: ", range(1, 6))
+                    levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+                    settings["log_level"] = levels[log_level_choice - 1]
+                    save_settings(settings)
+                    set_log_level(settings)
+                elif settings_choice == 5:
+                    settings["use_regex"] = not settings["use_regex"]
+                    save_settings(settings)
+                    status = "включена" if settings["use_regex"] else "выключена"
+                    print(f"Проверка через регулярные выражения {status}.")
+                elif settings_choice == 6:
+                    settings["use_validators"] = not settings["use_validators"]
+                    save_settings(settings)
+                    status = "включена" if settings["use_validators"] else "выключена"
+                    print(f"Проверка через Validators {status}.")
+                elif settings_choice == 7:
+                    run_debug_functions(url_links)
+                elif settings_choice == 8:
+                    reset_program()
+                    settings = load_settings()
+                    url_links = load_links()
+                    attach_store_listeners(url_links)
+                    set_log_level(settings)
+                    break
+                elif settings_choice == 9:
+                    manage_plugins() 
+                elif settings_choice == 10:
+                    configure_health_cache()
+                elif settings_choice == 11:
+                    switch_storage_backend(url_links)
+                elif settings_choice == 12:
+                    settings["normalize_urls"] = not settings["normalize_urls"]
+                    save_settings(settings)
+                    url_links.set_url_normalization(settings["normalize_urls"])
+                    status = "включено" if settings["normalize_urls"] else "выключено"
+                    print(f"Сравнение нормализованных URL {status}.")
+                elif settings_choice == 13:
+                    settings["offline_mode"] = not settings["offline_mode"]
+                    save_settings(settings)
+                    status = "включен" if settings["offline_mode"] else "выключен"
+                    print(f"Автономный режим {status}. Обновления не проверяются при запуске.")
+                elif settings_choice == 14:
+                    toggle_binary_snapshot()
+                elif settings_choice == 15:
+                    settings["regex_guard"] = not settings["regex_guard"]
+                    save_settings(settings)
+                    status = "включена" if settings["regex_guard"] else "выключена"
+                    print(f"Защита от медленных регулярных выражений {status}.")
+                elif settings_choice == 16:
+                    break
+
+        elif choice == 7:
+            count_links(url_links)
+
+        elif choice == 8:
+            filetypes = [("CSV files", "*.csv"),
+                         ("JSON files", "*.json"),
+                         ("YAML files", "*.yaml"),
+                         ("XML files", "*.xml"),
+                         ("DOCX files", "*.docx"),
+                         ("TXT files", "*.txt"),
+                         ("XLSX files", "*.xlsx"),
+                         ("All files", "*.*")]
+            filename = choose_file(save=True, filetypes=filetypes)
+            if filename:
+                format = filename.split('.')[-1].lower()
+                export_links(url_links, filename, format)
+
+        elif choice == 9:
+            filetypes = [("CSV files", "*.csv"),
+                         ("JSON files", "*.json"),
+                         ("YAML files", "*.yaml"),
+                         ("XML files", "*.xml"),
+                         ("DOCX files", "*.docx"),
+                         ("TXT files", "*.txt"),
+                         ("XLSX files", "*.xlsx"),
+                         ("All files", "*.*")]
+            filename = choose_file(save=False, filetypes=filetypes)
+            if filename:
+                format = filename.split('.')[-1].lower()
+                import_links(filename, format)
+
+        elif choice == 10:
+            query = input("Введите строку для поиска: ")
+            print("Выберите тип поиска:")
+            print("1. По ключевому слову")
+            print("2. По регулярному выражению")
+            search_type_choice = menu_option("Введите номер действия: ", [1, 2])
+            search_type = 'keyword' if search_type_choice == 1 else 'regex'
+            if search_type == 'regex' and get_search_pattern(query) is None:
+                continue
+
+            filters = {}
+            filter_category = input("Фильтровать по категории (или оставьте пустым): ")
+            if filter_category:
+                filters['category'] = filter_category
+
+            filter_date_from = input("Фильтровать по дате добавления (с) (YYYY-MM-DD, или оставьте пустым): ")
+            if filter_date_from:
+                filters['date_from'] = filter_date_from
+
+            filter_date_to = input("Фильтровать по дате добавления (по) (YYYY-MM-DD, или оставьте пустым): ")
+            if filter_date_to:
+                filters['date_to'] = filter_date_to
+
+            status_choice = input("Фильтровать по статусу ссылки (доступна/недоступна/нет): ").lower()
+            if status_choice == 'доступна':
+                filters['status'] = 'accessible'
+            elif status_choice == 'недоступна':
+                filters['status'] = 'inaccessible'
+
+            search_links(url_links, query, search_type, filters)
+
+        elif choice == 11:
+            show_statistics(url_links)
+
+        elif choice == 12:
+            print(Fore.GREEN + "Выход из Link Manager.")
+            logging.info("Программа завершена.")
+            shutdown_plugin_dispatcher()
+            shutdown_validation_pool()
+            save_scheduler.cancel('statistics')
+            save_statistics(statistics)
+            save_health_cache()
+            wait_for_journal_compaction()
+            close_db_connection()
+            break
 
-    elif choice == 4:
-        old_key = input("Введите текущий ключ: ")
-        new_key = input("Введите новый ключ: ")
-        if old_key in url_links:
-            url_links[new_key] = url_links.pop(old_key)
-            save_links(url_links)
-            print(Fore.GREEN + f"Ключ '{old_key}' переименован в '{new_key}'.")
-            logging.info(f"Ключ '{old_key}' переименован в '{new_key}'.")
         else:
-            print(Fore.RED + f"Ключ '{old_key}' не найден.")
-
-    elif choice == 5:
-        show_available_keys(url_links)
-
-    elif choice == 6:
-        while True:
-            print("\nНастройки:")
-            print("1. Изменить пароль для входа")
-            print("2. Пароль на открытие программы (сейчас: " + ("ВКЛ" if settings["password_required"] else "ВЫКЛ") + ")")
-            print("3. Отображать ссылки (сейчас: " + ("ВКЛ" if settings["show_links"] else "ВЫКЛ") + ")")
-            print("4. Уровень логирования (сейчас: " + settings.get("log_level", "INFO") + ")")
-            print("5. Проверка через регулярные выражения (сейчас: " + ("ВКЛ" if settings["use_regex"] else "ВЫКЛ") + ")")
-            print("6. Проверка через Validators (сейчас: " + ("ВКЛ" if settings["use_validators"] else "ВЫКЛ") + ")")
-            print("7. Отладочные функции")
-            print("8. Сброс программы")
-            print("9. Центр плагинов")
-            print("10. Назад")
-
-            settings_choice = menu_option("Введите номер действия: ", range(1, 11))
-
-            if settings_choice == 1:
-                new_password = getpass.getpass("Введите новый пароль: ")
-                settings["password"] = hash_password(new_password)
-                save_settings(settings)
-                print(Fore.GREEN + "Пароль изменен.")
-            elif settings_choice == 2:
-                settings["password_required"] = not settings["password_required"]
-                save_settings(settings)
-                status = "включено" if settings["password_required"] else "выключено"
-                print(f"Требование пароля {status}.")
-            elif settings_choice == 3:
-                settings["show_links"] = not settings["show_links"]
-                save_settings(settings)
-                status = "включено" if settings["show_links"] else "выключено"
-                print(f"Отображение ссылок {status}.")
-            elif settings_choice == 4:
-                print("\nВыберите уровень логирования:")
-                print("1. DEBUG")
-                print("2. INFO")
-                print("3. WARNING")
-                print("4. ERROR")
-                print("5. CRITICAL")
-                log_level_choice = menu_option("Введите номер уровня: ", range(1, 6))
-                levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-                settings["log_level"] = levels[log_level_choice - 1]
-                save_settings(settings)
-                set_log_level(settings)
-            elif settings_choice == 5:
-                settings["use_regex"] = not settings["use_regex"]
-                save_settings(settings)
-                status = "включена" if settings["use_regex"] else "выключена"
-                print(f"Проверка через регулярные выражения {status}.")
-            elif settings_choice == 6:
-                settings["use_validators"] = not settings["use_validators"]
-                save_settings(settings)
-                status = "включена" if settings["use_validators"] else "выключена"
-                print(f"Проверка через Validators {status}.")
-            elif settings_choice == 7:
-                run_debug_functions(url_links)
-            elif settings_choice == 8:
-                reset_program()
-                url_links = load_links()
-                settings = load_settings()
-                set_log_level(settings)
-                break
-            elif settings_choice == 9:
-                manage_plugins() 
-            elif settings_choice == 10:
-                break
-
-    elif choice == 7:
-        count_links(url_links)
-
-    elif choice == 8:
-        filetypes = [("CSV files", "*.csv"),
-                     ("JSON files", "*.json"),
-                     ("YAML files", "*.yaml"),
-                     ("XML files", "*.xml"),
-                     ("DOCX files", "*.docx"),
-                     ("TXT files", "*.txt"),
-                     ("XLSX files", "*.xlsx"),
-                     ("All files", "*.*")]
-        filename = choose_file(save=True, filetypes=filetypes)
-        if filename:
-            format = filename.split('.')[-1].lower()
-            export_links(url_links, filename, format)
-
-    elif choice == 9:
-        filetypes = [("CSV files", "*.csv"),
-                     ("JSON files", "*.json"),
-                     ("YAML files", "*.yaml"),
-                     ("XML files", "*.xml"),
-                     ("DOCX files", "*.docx"),
-                     ("TXT files", "*.txt"),
-                     ("XLSX files", "*.xlsx"),
-                     ("All files", "*.*")]
-        filename = choose_file(save=False, filetypes=filetypes)
-        if filename:
-            format = filename.split('.')[-1].lower()
-            import_links(filename, format)
-
-    elif choice == 10:
-        query = input("Введите строку для поиска: ")
-        print("Выберите тип поиска:")
-        print("1. По ключевому слову")
-        print("2. По регулярному выражению")
-        search_type_choice = menu_option("Введите номер действия: ", [1, 2])
-        search_type = 'keyword' if search_type_choice == 1 else 'regex'
-
-        filters = {}
-        filter_category = input("Фильтровать по категории (или оставьте пустым): ")
-        if filter_category:
-            filters['category'] = filter_category
-
-        filter_date_from = input("Фильтровать по дате добавления (с) (YYYY-MM-DD, или оставьте пустым): ")
-        if filter_date_from:
-            filters['date_from'] = filter_date_from
-
-        filter_date_to = input("Фильтровать по дате добавления (по) (YYYY-MM-DD, или оставьте пустым): ")
-        if filter_date_to:
-            filters['date_to'] = filter_date_to
-
-        status_choice = input("Фильтровать по статусу ссылки (доступна/недоступна/нет): ").lower()
-        if status_choice == 'доступна':
-            filters['status'] = 'accessible'
-        elif status_choice == 'недоступна':
-            filters['status'] = 'inaccessible'
-
-        search_links(url_links, query, search_type, filters)
-
-    elif choice == 11:
-        show_statistics(url_links)
+            print(Fore.RED + "Неверный ввод. Пожалуйста, попробуйте снова.")
 
-    elif choice == 12:
-        print(Fore.GREEN + "Выход из Link Manager.")
-        logging.info("Программа завершена.")
-        save_statistics(statistics)
-        break
 
-    else:
-        print(Fore.RED + "Неверный ввод. Пожалуйста, попробуйте снова.")
+    os.makedirs(PLUGINS_DIR, exist_ok=True) 
+    plugins_config = load_plugins_config()
+    discover_plugins()
+    # save_plugins_config(plugins_config) # Сохранение происходит внутри discover_plugins и manage_plugins
 
 
-os.makedirs(PLUGINS_DIR, exist_ok=True) 
-plugins_config = load_plugins_config()
-discover_plugins()
-# save_plugins_config(plugins_config) # Сохранение происходит внутри discover_plugins и manage_plugins
+if __name__ == "__main__":
+    main()
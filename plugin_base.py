@@ -1,8 +1,37 @@
 # plugin_base.py
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Mapping, Callable, NamedTuple
+
+# Версия API плагинов: 1 - метод run со всем словарем ссылок, 2 - события изменений (ChangeSetPlugin)
+PLUGIN_API_VERSION = 2
+
+
+class LinkChangeEvent(NamedTuple):
+    """
+    Изменение хранилища ссылок.
+
+    sequence - номер события, возрастающий в пределах сеанса программы.
+    type - 'added', 'updated', 'deleted', 'renamed' или 'imported'.
+    before/after - данные ссылки до и после изменения (только для чтения;
+    dict(event.after) дает обычный словарь, например для json.dumps).
+    old_key - прежний ключ для 'renamed'; records - импортированные ссылки для 'imported'.
+    """
+    sequence: int
+    type: str
+    key: Optional[str]
+    before: Optional[Mapping[str, Optional[str]]] = None
+    after: Optional[Mapping[str, Optional[str]]] = None
+    old_key: Optional[str] = None
+    records: Optional[Mapping[str, Mapping[str, Optional[str]]]] = None
 
 class LinkManagerPlugin(ABC):
+    api_version: int = 1
+    # Вызовы плагина выполняются в фоне; при ordered = True - строго по очереди
+    ordered: bool = True
+    # Время на один вызов в секундах; None - значение plugin_timeout из настроек
+    timeout: Optional[float] = None
+
     @staticmethod
     @abstractmethod
     def plugin_info() -> Dict[str, Any]:
@@ -13,12 +42,15 @@ class LinkManagerPlugin(ABC):
         pass
 
     @abstractmethod
-    def run(self, url_links: Dict[str, Dict[str, str]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+    def run(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
         """
         Основной метод плагина, вызываемый Link Manager.
 
         Args:
-            url_links: Словарь всех URL-ссылок.
+            url_links: Копия всех URL-ссылок на момент вызова - обычный словарь из обычных словарей
+                (плагин работает в фоновом потоке). Сделанные в ней изменения сохраняются одним
+                пакетом после того, как run вернет управление; если run завершился с ошибкой
+                или не уложился во время, изменения не сохраняются.
             action: Действие, вызвавшее плагин (например, 'open', 'add', 'delete', 'export').
             key: Ключ URL, если действие связано с конкретной ссылкой.
             kwargs: Дополнительные аргументы, которые могут быть переданы плагину.
@@ -27,3 +59,43 @@ class LinkManagerPlugin(ABC):
             Может возвращать любые данные в зависимости от назначения плагина.
         """
         pass
+
+
+class AsyncLinkManagerPlugin(LinkManagerPlugin):
+    """
+    Плагин с асинхронным методом run_async. Link Manager выполняет его в цикле
+    событий и отменяет вызов, если он не уложился в отведенное время.
+    """
+
+    @abstractmethod
+    async def run_async(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+        """
+        Асинхронный вариант метода run с теми же аргументами.
+        """
+        pass
+
+    def run(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+        return asyncio.run(self.run_async(url_links, action, key, **kwargs))
+
+
+class ChangeSetPlugin(LinkManagerPlugin):
+    """
+    Плагин API версии 2. Вместо всего словаря ссылок при каждом изменении получает
+    событие LinkChangeEvent; снимок всех ссылок можно запросить функцией snapshot.
+    Метод run по-прежнему вызывается для действий, не меняющих ссылки ('open', 'export').
+    """
+    api_version: int = 2
+
+    @abstractmethod
+    def on_change(self, event: LinkChangeEvent, snapshot: Callable[[], Mapping[str, Mapping[str, Optional[str]]]]) -> Any:
+        """
+        Вызывается после каждого изменения ссылок.
+
+        Args:
+            event: Описание изменения.
+            snapshot: Функция, возвращающая снимок всех ссылок только для чтения.
+        """
+        pass
+
+    def run(self, url_links: Dict[str, Dict[str, Optional[str]]], action: str = None, key: str = None, **kwargs: Any) -> Any:
+        pass